@@ -1,9 +1,34 @@
 import json
 import math
+import mmap
+import struct
+import sys
+import weakref
+from array import array
 from dataclasses import dataclass, field
-from typing import List, Dict, Any
+from collections import OrderedDict, namedtuple
+from typing import List, Dict, Any, Optional
 from enum import Enum
 
+import numpy as np
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# Packed clip container (little-endian):
+#   header     magic, version, flags (bit 0: loop), track count, duration, meta length
+#   meta       UTF-8 JSON (name, events, per-track names/columns/labels), padded to 4 bytes
+#   directory  one entry per track: keyframe count, width, reserved, times offset, values offset
+#              (reserved is a u16 that must be zero; it keeps entries 16 bytes so
+#              the float32 data stays 4-byte aligned)
+#   data       per track: float32 times (seconds), then float32 values (row-major)
+PACKED_MAGIC = b"TBPK"
+PACKED_VERSION = 1
+PACKED_HEADER = struct.Struct("<4sHHIfI")
+PACKED_ENTRY = struct.Struct("<IHHII")
+PackedTrackInfo = namedtuple(
+    "PackedTrackInfo", ["name", "columns", "labels", "count", "width", "times_offset", "values_offset"]
+)
+
 class MotionType(Enum):
     LINEAR = "linear"
     CIRCULAR = "circular"
@@ -11,6 +36,155 @@ class MotionType(Enum):
     WIGGLE = "wiggle"
     BOUNCE = "bounce"
     EASE_IN_OUT = "ease_in_out"
+    STATIC = "static"
+    ANGLED = "angled"
+    ANGLED_45 = "angled_45"
+
+class PrimaryAction(Enum):
+    IDLE = "idle"
+    WAVE = "wave"
+    GREETING = "greeting"
+    PICKUP = "pickup"
+    RINSING = "rinsing"
+    SWISHING = "swishing"
+    SPITTING = "spitting"
+    APPLYING_PASTE = "applying_paste"
+    OPEN_MOUTH = "openMouth"
+    BRUSHING = "brushing"
+    TONGUE_OUT = "tongueOut"
+    CELEBRATE = "celebrate"
+    THUMBS_UP = "thumbsUp"
+
+class Emotion(Enum):
+    NEUTRAL = "neutral"
+    HAPPY = "happy"
+    EXCITED = "excited"
+    CALM = "calm"
+    ENCOURAGING = "encouraging"
+    PLAYFUL = "playful"
+
+# Action fields stored as enum members; other values (free-form model
+# answers) are kept as interned strings
+ACTION_ENUMS = {"primary_action": PrimaryAction, "motion_type": MotionType, "emotion": Emotion}
+_MISSING = object()
+
+class _FrozenMap(tuple):
+    """
+    A dict frozen into (key, value) pairs; thawed back into a dict.
+    Never equal to a plain tuple, so {"a": 1} and [("a", 1)] stay distinct.
+    """
+    __slots__ = ()
+    
+    def __eq__(self, other):
+        return type(other) is _FrozenMap and tuple.__eq__(self, other)
+    
+    def __ne__(self, other):
+        return not self == other
+    
+    def __hash__(self):
+        return hash((_FrozenMap, tuple(self)))
+
+def _freeze(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, _FrozenMap):
+        return value
+    if isinstance(value, dict):
+        return _FrozenMap((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _thaw(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, _FrozenMap):
+        return {key: _thaw(item) for key, item in value}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+def _action_value(field_name: str, value):
+    enum = ACTION_ENUMS.get(field_name)
+    if enum is not None:
+        try:
+            return enum(value)
+        except ValueError:
+            pass
+    return _freeze(value)
+
+class ActionDescriptor:
+    """
+    Immutable, hashable form of an extracted action dict.
+    
+    primary_action, motion_type and emotion are enum members, lists are
+    tuples and nested dicts are frozen, and the hash is computed once, so
+    descriptors compare, deduplicate and key caches in O(1). `get()`
+    reads it like the original dict (enum fields as their string values,
+    lists as tuples), and `to_dict()` rebuilds that dict with its keys in
+    the original order for JSON output.
+    
+    `signature` holds only the fields the generators read, with their
+    defaults; it keys the engine's template cache.
+    """
+    __slots__ = ("_values", "_hash", "signature")
+    
+    def __init__(self, actions: dict):
+        values = {key: _action_value(key, value) for key, value in actions.items()}
+        object.__setattr__(self, "_values", values)
+        object.__setattr__(self, "_hash", hash(frozenset(values.items())))
+        object.__setattr__(self, "signature", (
+            values.get("primary_action", PrimaryAction.IDLE),
+            values.get("motion_type", MotionType.LINEAR),
+            values.get("emotion"),
+            values.get("sub_actions", ()),
+        ))
+    
+    @classmethod
+    def coerce(cls, actions) -> "ActionDescriptor":
+        """`actions` itself if it is already a descriptor, else a descriptor of the dict."""
+        return actions if isinstance(actions, cls) else cls(actions)
+    
+    def get(self, key: str, default=None):
+        value = self._values.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        if isinstance(value, (Enum, _FrozenMap)):
+            return _thaw(value)
+        return value
+    
+    def __getitem__(self, key: str):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._values
+    
+    def replace(self, **changes) -> "ActionDescriptor":
+        """Copy with some fields changed (new fields are added last)."""
+        return ActionDescriptor({**self._values, **changes})
+    
+    def to_dict(self) -> dict:
+        return {key: _thaw(value) for key, value in self._values.items()}
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("ActionDescriptor is immutable; use replace()")
+    
+    def __hash__(self) -> int:
+        return self._hash
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ActionDescriptor):
+            return NotImplemented
+        return self._hash == other._hash and self._values == other._values
+    
+    def __reduce__(self):
+        return ActionDescriptor, (self.to_dict(),)
+    
+    def __repr__(self) -> str:
+        return f"ActionDescriptor({self.to_dict()!r})"
 
 @dataclass
 class Keyframe:
@@ -18,11 +192,322 @@ class Keyframe:
     properties: Dict[str, float]
     easing: str = "easeInOut"
 
-@dataclass
+class PropertyTable:
+    """
+    Interns a track's strings (property keys, easings and discrete values).
+    
+    Ids are only meaningful within a track's table. Tracks holding the same
+    strings share one table (see `shared`), which is only referenced weakly
+    otherwise, so a table and its strings are freed with the last track
+    using it instead of accumulating for the life of the process.
+    """
+    __slots__ = ("_ids", "_names", "__weakref__")
+    
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+    
+    def intern(self, name: str) -> int:
+        ident = self._ids.get(name)
+        if ident is None:
+            ident = len(self._names)
+            self._ids[name] = ident
+            self._names.append(name)
+        return ident
+    
+    def name(self, ident: int) -> str:
+        return self._names[ident]
+    
+    @property
+    def names(self) -> List[str]:
+        """Every interned string, indexed by id (read-only by convention)."""
+        return self._names
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def shared(self) -> "PropertyTable":
+        """The live table with the same strings in the same order (this one if there is none)."""
+        key = tuple(self._names)
+        table = _SHARED_TABLES.get(key)
+        if table is None:
+            _SHARED_TABLES[key] = table = self
+        return table
+
+_SHARED_TABLES: "weakref.WeakValueDictionary[tuple, PropertyTable]" = weakref.WeakValueDictionary()
+
 class AnimationTrack:
-    target: str  # "arm", "mouth", "body", etc.
-    property: str  # "rotation", "position", "scale"
-    keyframes: List[Keyframe] = field(default_factory=list)
+    """
+    Keyframed channel stored as struct-of-arrays.
+    
+    `times` holds one normalized time per keyframe and `values` holds the
+    keyframe rows back to back, one value per column. Column names, easings
+    and discrete (string) values are ids into the track's `table`; a
+    property missing from a keyframe is stored as NaN. `kinds` has one
+    character per column: "i" (int), "f" (float), "m" (mixed, see
+    `int_mask`) or "s" (discrete). `int_mask` is only allocated for tracks
+    with mixed columns and flags which values were ints, so exports stay
+    byte-identical.
+    
+    Tracks are still built from `Keyframe` lists. Exporters read the
+    columns through `rows`/`flat_values`; `track.keyframes` remains as a
+    compatibility view for other callers.
+    """
+    __slots__ = ("target", "property", "table", "columns", "kinds", "times", "values", "easings", "int_mask")
+    
+    def __init__(self, target: str, property: str, keyframes: Optional[List[Keyframe]] = None):
+        self.target = target  # "arm", "mouth", "body", etc.
+        self.property = property  # "rotation", "position", "scale"
+        table = PropertyTable()
+        keyframes = keyframes or []
+        
+        keys = []
+        for kf in keyframes:
+            for key in kf.properties:
+                if key not in keys:
+                    keys.append(key)
+        
+        kinds = []
+        for key in keys:
+            column = [kf.properties[key] for kf in keyframes if key in kf.properties]
+            if any(isinstance(v, str) for v in column):
+                kinds.append("s")
+            elif all(isinstance(v, int) for v in column):
+                kinds.append("i")
+            elif any(isinstance(v, int) for v in column):
+                kinds.append("m")
+            else:
+                kinds.append("f")
+        
+        self.columns = tuple(table.intern(key) for key in keys)
+        self.kinds = "".join(kinds)
+        self.times = array("d", (kf.time for kf in keyframes))
+        self.easings = array("I", (table.intern(kf.easing) for kf in keyframes))
+        self.values = array("d")
+        self.int_mask = bytearray() if "m" in kinds else None
+        for kf in keyframes:
+            for key, kind in zip(keys, kinds):
+                value = kf.properties.get(key)
+                if value is None:
+                    self.values.append(math.nan)
+                elif kind == "s":
+                    self.values.append(table.intern(str(value)))
+                else:
+                    self.values.append(value)
+                if self.int_mask is not None:
+                    self.int_mask.append(isinstance(value, int))
+        self.table = table.shared()
+    
+    @classmethod
+    def from_columns(cls, target: str, property: str, column_names: List[str], kinds: str,
+                     times, values, easings=None, table: Optional[PropertyTable] = None) -> "AnimationTrack":
+        """
+        Build a track directly from column arrays (values row-major).
+        
+        Discrete values and easings are ids into `table` (a new one if not
+        given), which the column names are added to.
+        """
+        track = cls(target, property)
+        table = table if table is not None else PropertyTable()
+        track.columns = tuple(table.intern(name) for name in column_names)
+        track.kinds = kinds.replace("m", "f")  # No int_mask to go with it
+        track.times = array("d", times)
+        track.values = array("d", values)
+        if easings is None:
+            easings = [table.intern("easeInOut")] * len(track.times)
+        track.easings = array("I", easings)
+        track.table = table.shared()
+        return track
+    
+    @property
+    def column_names(self) -> tuple:
+        return tuple(self.table.name(c) for c in self.columns)
+    
+    @property
+    def width(self) -> int:
+        return len(self.columns)
+    
+    @property
+    def keyframes(self) -> List[Keyframe]:
+        """Compatibility view: the track as a list of `Keyframe` objects."""
+        names = self.column_names
+        width = len(names)
+        keyframes = []
+        for i, time in enumerate(self.times):
+            properties = {}
+            for c in range(width):
+                value = self.values[i * width + c]
+                if value != value:  # NaN: property not keyed here
+                    continue
+                kind = self.kinds[c]
+                if kind == "s":
+                    properties[names[c]] = self.table.name(int(value))
+                elif kind == "i" or (kind == "m" and self.int_mask[i * width + c]):
+                    properties[names[c]] = int(value)
+                else:
+                    properties[names[c]] = value
+            keyframes.append(Keyframe(time, properties, self.table.name(self.easings[i])))
+        return keyframes
+    
+    def flat_values(self) -> list:
+        """
+        Keyed values of every keyframe back to back, decoded as in
+        `keyframes` but read straight from the columns (the Three.js
+        "values" array).
+        """
+        flat = self._numeric_values()
+        if flat is not None:
+            return flat
+        return [value for row in self.rows() for value in row]
+    
+    def first_values(self) -> list:
+        """Each keyframe's first keyed value (the value the Lottie export keys)."""
+        flat = self._numeric_values()
+        if flat is not None and self.columns:
+            return flat[::len(self.columns)]
+        return [row[0] for row in self.rows()]
+    
+    def rows(self) -> List[list]:
+        """Each keyframe's keyed values in column order, decoded like flat_values."""
+        width = len(self.columns)
+        if not width:
+            return [[] for _ in self.times]
+        flat = self._numeric_values()
+        if flat is not None:
+            return [flat[start:start + width] for start in range(0, len(flat), width)]
+        
+        flat = self.values.tolist()
+        names = self.table.names
+        kinds = self.kinds
+        mask = self.int_mask
+        rows = []
+        for start in range(0, len(flat), width):
+            row = []
+            for c in range(width):
+                value = flat[start + c]
+                if value != value:  # NaN: property not keyed here
+                    continue
+                kind = kinds[c]
+                if kind == "s":
+                    row.append(names[int(value)])
+                elif kind == "i" or (kind == "m" and mask[start + c]):
+                    row.append(int(value))
+                else:
+                    row.append(value)
+            rows.append(row)
+        return rows
+    
+    def _numeric_values(self) -> Optional[list]:
+        """The decoded values if every column is int or float and fully keyed (the common case), else None."""
+        kinds = self.kinds
+        if "s" in kinds or "m" in kinds:
+            return None
+        flat = self.values.tolist()
+        if any(map(math.isnan, flat)):
+            return None
+        if "f" not in kinds:
+            return list(map(int, flat))
+        width = len(kinds)
+        for c, kind in enumerate(kinds):
+            if kind == "i":
+                flat[c::width] = list(map(int, flat[c::width]))
+        return flat
+    
+    def times_array(self) -> np.ndarray:
+        """Zero-copy NumPy view of the keyframe times."""
+        return np.frombuffer(self.times, dtype=np.float64)
+    
+    def values_array(self) -> np.ndarray:
+        """Zero-copy (keyframes, columns) NumPy view of the values."""
+        return np.frombuffer(self.values, dtype=np.float64).reshape(len(self.times), len(self.columns))
+    
+    @property
+    def frozen(self) -> bool:
+        return isinstance(self.times, memoryview)
+    
+    def freeze(self) -> "AnimationTrack":
+        """
+        Make the track immutable in place so it can be shared between clips.
+        
+        The columns become read-only memoryviews (NumPy views of them are
+        read-only too) and attribute assignment raises. Use `copy()` to get
+        an editable track back.
+        """
+        if not self.frozen:
+            for name in ("times", "values", "easings"):
+                object.__setattr__(self, name, memoryview(getattr(self, name)).toreadonly())
+            if self.int_mask is not None:
+                object.__setattr__(self, "int_mask", bytes(self.int_mask))
+        return self
+    
+    def copy(self) -> "AnimationTrack":
+        """Editable deep copy of the track."""
+        track = AnimationTrack(self.target, self.property)
+        track.table = self.table
+        track.columns = self.columns
+        track.kinds = self.kinds
+        track.times = array("d", self.times)
+        track.values = array("d", self.values)
+        track.easings = array("I", self.easings)
+        track.int_mask = bytearray(self.int_mask) if self.int_mask is not None else None
+        return track
+    
+    def __setattr__(self, name, value):
+        if isinstance(getattr(self, "times", None), memoryview):
+            raise AttributeError(f"{self!r} is frozen; use copy() to edit it")
+        object.__setattr__(self, name, value)
+    
+    def take(self, indices) -> "AnimationTrack":
+        """Editable track holding only the given keyframe rows."""
+        width = self.width
+        track = AnimationTrack(self.target, self.property)
+        track.table = self.table
+        track.columns = self.columns
+        track.kinds = self.kinds
+        track.times = array("d", (self.times[i] for i in indices))
+        track.values = array("d", (self.values[i * width + c] for i in indices for c in range(width)))
+        track.easings = array("I", (self.easings[i] for i in indices))
+        if self.int_mask is not None:
+            track.int_mask = bytearray(self.int_mask[i * width + c] for i in indices for c in range(width))
+        return track
+    
+    def __reduce__(self):
+        # Pickle the keyframe view rather than the raw columns and their id
+        # table (tracks are sent to export worker processes)
+        return _unpickle_track, (self.target, self.property, self.keyframes, self.frozen)
+    
+    def __len__(self) -> int:
+        return len(self.times)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, AnimationTrack):
+            return NotImplemented
+        return (
+            self.target == other.target
+            and self.property == other.property
+            and self.kinds == other.kinds
+            and self.times.tobytes() == other.times.tobytes()
+            and (self.int_mask is None) == (other.int_mask is None)
+            and bytes(self.int_mask or b"") == bytes(other.int_mask or b"")
+            and self._resolved() == other._resolved()
+        )
+    
+    def _resolved(self) -> tuple:
+        """Columns, easings and values with ids resolved to strings, since tracks may use different tables."""
+        values = self.values_array().copy()
+        discrete = []
+        for c, kind in enumerate(self.kinds):
+            if kind == "s":
+                discrete.append(tuple(None if v != v else self.table.name(int(v)) for v in values[:, c]))
+                values[:, c] = 0.0
+        easings = tuple(self.table.name(e) for e in self.easings)
+        return self.column_names, easings, values.tobytes(), tuple(discrete)
+    
+    def __repr__(self) -> str:
+        return (
+            f"AnimationTrack(target={self.target!r}, property={self.property!r}, "
+            f"columns={self.column_names!r}, keyframes={len(self.times)})"
+        )
 
 @dataclass 
 class Animation:
@@ -32,14 +517,257 @@ class Animation:
     loop: bool = False
     events: List[Dict] = field(default_factory=list)  # Sound/particle triggers
 
+@dataclass
+class BakedAnimation:
+    """Dense per-frame samples of every channel in an Animation."""
+    name: str
+    duration: float
+    fps: int
+    loop: bool
+    channels: List[str]  # "target.property" or "target.property.key"
+    times: np.ndarray  # (frames,) seconds
+    values: np.ndarray  # (channels, frames)
+    labels: Dict[str, List[str]] = field(default_factory=dict)  # Discrete channels
+    events: List[Dict] = field(default_factory=list)
+
+    def channel(self, name: str) -> np.ndarray:
+        """Samples of the first channel called `name`."""
+        return self.values[self.channels.index(name)]
+
+# Largest deviation simplify_track may introduce, per column name;
+# anything not listed is a normalized 0..1 property
+SIMPLIFY_TOLERANCES = {
+    "rotation": 0.5,  # degrees
+    "x": 0.5,
+    "y": 0.5,
+    "offset_x": 0.5,
+    "scale": 0.005,
+}
+DEFAULT_SIMPLIFY_TOLERANCE = 0.01
+
+def simplify_track(track: AnimationTrack, tolerances: Optional[Dict[str, float]] = None,
+                   default_tolerance: float = DEFAULT_SIMPLIFY_TOLERANCE) -> AnimationTrack:
+    """
+    Drop keyframes that linear interpolation reproduces within tolerance
+    (Ramer-Douglas-Peucker over time, error normalized per column).
+    
+    First/last keyframes, changes of discrete values and keyframes with
+    unkeyed properties are always kept. Returns the same track object
+    when nothing can be removed.
+    """
+    n = len(track)
+    if n <= 2:
+        return track
+    tolerances = SIMPLIFY_TOLERANCES if tolerances is None else tolerances
+    
+    times = track.times_array()
+    values = track.values_array()
+    numeric = np.array([kind != "s" for kind in track.kinds], dtype=bool)
+    tol = np.array([tolerances.get(name, default_tolerance) for name in track.column_names])
+    
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    keep |= np.isnan(values).any(axis=1)
+    if not numeric.all():
+        discrete = values[:, ~numeric]
+        changed = (discrete[1:] != discrete[:-1]).any(axis=1)
+        keep[1:] |= changed
+        keep[:-1] |= changed
+    
+    if numeric.any():
+        scaled = values[:, numeric] / np.maximum(tol[numeric], 1e-12)
+        anchors = np.flatnonzero(keep)
+        stack = list(zip(anchors[:-1], anchors[1:]))
+        while stack:
+            a, b = stack.pop()
+            if b - a < 2:
+                continue
+            span = times[b] - times[a]
+            w = (times[a + 1:b] - times[a]) / span if span > 0 else np.zeros(b - a - 1)
+            line = scaled[a] + (scaled[b] - scaled[a]) * w[:, None]
+            err = np.nan_to_num(np.abs(scaled[a + 1:b] - line).max(axis=1), nan=np.inf)
+            worst = int(np.argmax(err))
+            if err[worst] > 1.0:
+                m = a + 1 + worst
+                keep[m] = True
+                stack.append((a, m))
+                stack.append((m, b))
+    
+    if keep.all():
+        return track
+    return track.take(np.flatnonzero(keep).tolist())
+
+SUB_ACTION_SPAN = 0.3  # Fraction of the clip a sub-action plays over
+SUB_ACTION_WEIGHT = 1.0  # Blend weight of sub-action layers (base layers are 1.0)
+
+@dataclass
+class TrackLayer:
+    """A track placed in a clip: played over [start, start + span] with a blend weight."""
+    track: AnimationTrack
+    weight: float = 1.0
+    start: float = 0.0
+    span: float = 1.0
+
+def mix_layers(layers: List[TrackLayer]) -> List[AnimationTrack]:
+    """
+    Resolve layers to one track per target.property, in first-seen order.
+    
+    Single layers are passed through (remapped into their window by
+    place_layer); only overlapping layers go through mix_tracks.
+    """
+    groups: Dict[tuple, List[TrackLayer]] = {}
+    for layer in layers:
+        groups.setdefault((layer.track.target, layer.track.property), []).append(layer)
+    
+    tracks = []
+    for group in groups.values():
+        track = place_layer(group[0]) if len(group) == 1 else None
+        tracks.append(track if track is not None else mix_tracks(group))
+    return tracks
+
+def place_layer(layer: TrackLayer) -> Optional[AnimationTrack]:
+    """
+    A lone layer as a clip track, without going through NumPy: its keys
+    remapped into the window and its edge values held out to 0 and 1.
+    
+    Returns None for layers mix_tracks has to resolve (windows reaching
+    outside the clip, partly keyed rows or mixed int/float columns).
+    """
+    track = layer.track
+    if layer.start == 0.0 and layer.span == 1.0:
+        return track
+    if (not len(track) or track.int_mask is not None or layer.span <= 0
+            or layer.start < 0 or layer.start + layer.span > 1
+            or any(map(math.isnan, track.values))):
+        return None
+    
+    width = track.width
+    placed = track.copy()
+    placed.times = array("d", (layer.start + time * layer.span for time in track.times))
+    if placed.times[0] > 0.0:
+        placed.times.insert(0, 0.0)
+        placed.values[0:0] = placed.values[:width]
+        placed.easings.insert(0, placed.easings[0])
+    if placed.times[-1] < 1.0:
+        placed.times.append(1.0)
+        placed.values.extend(placed.values[len(placed.values) - width:])
+        placed.easings.append(placed.easings[-1])
+    return placed
+
+def mix_tracks(layers: List[TrackLayer]) -> AnimationTrack:
+    """
+    Merge layers writing the same target.property into a single track.
+    
+    Keys are placed at every layer keyframe (mapped into its window) and
+    window edge. Numeric columns are the weighted average of the layers
+    active at that time; discrete columns take the active layer with the
+    highest weight (later layers win ties). Where no layer with a column
+    is active, its held edge values are averaged. Layers fade in/out
+    linearly between their window edge and the neighbouring key.
+    """
+    first = layers[0].track
+    columns = [layer.track.column_names for layer in layers]
+    names: List[str] = []
+    kinds: Dict[str, str] = {}
+    for layer, layer_names in zip(layers, columns):
+        for name, kind in zip(layer_names, layer.track.kinds):
+            if name not in kinds:
+                names.append(name)
+                kinds[name] = kind
+            elif kind == "s" or kinds[name] == "s":
+                kinds[name] = "s"
+            elif kind != kinds[name]:
+                kinds[name] = "f"
+    
+    knots = [np.array([0.0, 1.0])]
+    for layer in layers:
+        knots.append(layer.start + layer.track.times_array() * layer.span)
+        knots.append(np.array([layer.start, layer.start + layer.span]))
+    times = np.unique(np.clip(np.concatenate(knots), 0.0, 1.0))
+    
+    # Per layer: its local time at every key and whether it is playing there
+    windows = []
+    for layer in layers:
+        local_t = (times - layer.start) / layer.span if layer.span > 0 else np.zeros(len(times))
+        active = (times >= layer.start - 1e-9) & (times <= layer.start + layer.span + 1e-9)
+        windows.append((local_t, active, layer.track.times_array(), layer.track.values_array()))
+    
+    table = PropertyTable()
+    values = np.full((len(times), len(names)), np.nan)
+    for c, name in enumerate(names):
+        weighted = np.zeros(len(times))
+        total = np.zeros(len(times))
+        held = []
+        best = np.full(len(times), -np.inf)
+        discrete = np.full(len(times), np.nan)
+        for layer, layer_names, (local_t, active, layer_times, layer_values) in zip(layers, columns, windows):
+            if name not in layer_names:
+                continue
+            index = layer_names.index(name)
+            column = layer_values[:, index]
+            keyed = ~np.isnan(column)
+            if not keyed.any():
+                continue
+            if layer.track.kinds[index] == "s":
+                # Discrete ids are per track; re-intern them into the mixed track's table
+                column = column.copy()
+                column[keyed] = [table.intern(layer.track.table.name(int(v))) for v in column[keyed]]
+            local = layer_times[keyed]
+            
+            if kinds[name] == "s":
+                # Hold the last passed keyframe
+                idx = np.clip(np.searchsorted(local, local_t, side="right") - 1, 0, len(local) - 1)
+                sampled = column[keyed][idx]
+                wins = active & (layer.weight >= best)
+                discrete[wins] = sampled[wins]
+                best[wins] = layer.weight
+            else:
+                sampled = np.interp(local_t, local, column[keyed])
+                weighted += np.where(active, layer.weight * sampled, 0.0)
+                total += np.where(active, layer.weight, 0.0)
+            held.append(sampled)
+        
+        if not held:
+            continue
+        fallback = np.mean(held, axis=0) if kinds[name] != "s" else held[0]
+        if kinds[name] == "s":
+            values[:, c] = np.where(np.isnan(discrete), fallback, discrete)
+        else:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                values[:, c] = np.where(total > 0, weighted / np.where(total > 0, total, 1.0), fallback)
+    
+    # Blended ints are only kept as ints if they stayed whole
+    for c, name in enumerate(names):
+        if kinds[name] == "i":
+            column = values[:, c][~np.isnan(values[:, c])]
+            if not np.array_equal(column, np.round(column)):
+                kinds[name] = "f"
+    
+    return AnimationTrack.from_columns(
+        first.target, first.property, names, "".join(kinds[name] for name in names),
+        times, values.ravel(), table=table
+    )
+
+def _unpickle_track(target: str, property: str, keyframes: List[Keyframe], frozen: bool) -> AnimationTrack:
+    track = AnimationTrack(target, property, keyframes)
+    return track.freeze() if frozen else track
+
 class AnimationEngine:
     """
     Generates procedural animations for avatar actions.
     Outputs Lottie-compatible JSON or Three.js animation clips.
     """
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 256):
         self.animations: Dict[str, Animation] = {}
+        
+        # LRU of generated clips keyed on their action signature; clips
+        # are normalized 0..1 so most storyboard rows share a template
+        self.cache_size = cache_size
+        self._templates: "OrderedDict[tuple, Animation]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
         self.body_parts = {
             "head": {"x": 0, "y": 100, "rotation": 0},
             "mouth": {"open": 0, "smile": 0.5},
@@ -51,10 +779,58 @@ class AnimationEngine:
             "body": {"y": 0, "scale": 1}
         }
     
-    def generate_animation(self, action_data: dict, duration: float) -> Animation:
+    def generate_animation(self, action_data: "ActionDescriptor | dict", duration: float) -> Animation:
         """
         Generate animation based on parsed action data.
+        
+        Clips are served from the template cache when an identical action
+        signature was generated before. The returned Animation is always a
+        fresh object (safe to rename or append to), but its tracks are
+        frozen and shared with the cache; `copy()` a track to edit it.
+        Plain action dicts are normalized into an ActionDescriptor first.
         """
+        action_data = ActionDescriptor.coerce(action_data)
+        if self.cache_size <= 0:
+            return self._build_animation(action_data, duration)
+        
+        key = self._action_signature(action_data, duration)
+        
+        template = self._templates.get(key)
+        if template is None:
+            self.cache_misses += 1
+            template = self._build_animation(action_data, duration)
+            for track in template.tracks:
+                track.freeze()
+            self._templates[key] = template
+            if len(self._templates) > self.cache_size:
+                self._templates.popitem(last=False)
+        else:
+            self.cache_hits += 1
+            self._templates.move_to_end(key)
+        
+        return Animation(
+            name=template.name,
+            duration=template.duration,
+            tracks=list(template.tracks),
+            loop=template.loop,
+            events=[dict(event) for event in template.events],
+        )
+    
+    def cache_info(self) -> CacheInfo:
+        """Template cache statistics, like functools.lru_cache."""
+        return CacheInfo(self.cache_hits, self.cache_misses, self.cache_size, len(self._templates))
+    
+    def cache_clear(self):
+        self._templates.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    @staticmethod
+    def _action_signature(action_data: ActionDescriptor, duration: float) -> tuple:
+        """Template cache key: the descriptor's precomputed signature and the duration."""
+        return action_data.signature, float(duration)
+    
+    def _build_animation(self, action_data: ActionDescriptor, duration: float) -> Animation:
         primary_action = action_data.get("primary_action", "idle")
         
         # Route to specific generator
@@ -77,12 +853,16 @@ class AnimationEngine:
         generator = generator_map.get(primary_action, self._gen_idle)
         animation = generator(action_data, duration)
         
-        # Add sub-actions
-        for sub_action in action_data.get("sub_actions", []):
-            sub_gen = generator_map.get(sub_action)
-            if sub_gen:
-                sub_anim = sub_gen(action_data, duration * 0.3)
-                animation.tracks.extend(sub_anim.tracks)
+        # Layer sub-actions over the first 30% of the clip and resolve
+        # every target.property to a single track
+        sub_layers = [
+            TrackLayer(track, weight=SUB_ACTION_WEIGHT, start=0.0, span=SUB_ACTION_SPAN)
+            for sub_action in action_data.get("sub_actions", [])
+            if sub_action in generator_map
+            for track in generator_map[sub_action](action_data, duration * SUB_ACTION_SPAN).tracks
+        ]
+        if sub_layers:
+            animation.tracks = mix_layers([TrackLayer(track) for track in animation.tracks] + sub_layers)
         
         return animation
     
@@ -593,6 +1373,115 @@ class AnimationEngine:
         
         return anim
     
+    def simplify(self, animation: Animation, tolerances: Optional[Dict[str, float]] = None,
+                 default_tolerance: float = DEFAULT_SIMPLIFY_TOLERANCE) -> Animation:
+        """Copy of the animation with redundant keyframes removed from every track."""
+        return Animation(
+            name=animation.name,
+            duration=animation.duration,
+            tracks=[simplify_track(t, tolerances, default_tolerance) for t in animation.tracks],
+            loop=animation.loop,
+            events=list(animation.events),
+        )
+    
+    def bake(self, animation: Animation, fps: int = 30) -> BakedAnimation:
+        """
+        Sample every track of an animation into dense per-frame arrays.
+        
+        All channels and frames are interpolated in one vectorized pass.
+        Numeric properties are interpolated linearly (as Three.js does);
+        non-numeric ones (e.g. gesture names) are held and stored as
+        indices into `BakedAnimation.labels`.
+        """
+        frame_count = max(round(animation.duration * fps), 1) + 1
+        times = np.arange(frame_count, dtype=np.float64) / fps
+        if animation.duration > 0:
+            t = np.clip(times / animation.duration, 0.0, 1.0)
+        else:
+            t = np.zeros(frame_count)
+        
+        # Split every track into one knot list per column, read straight
+        # from the track's column arrays
+        channels = []
+        knots = []
+        labels = {}
+        discrete = []
+        for track in animation.tracks:
+            track_times = track.times_array()
+            track_values = track.values_array()
+            for c, key in enumerate(track.column_names):
+                name = f"{track.target}.{track.property}"
+                if key != track.property:
+                    name = f"{name}.{key}"
+                column = track_values[:, c]
+                keyed = ~np.isnan(column)
+                knot_times, knot_values = track_times[keyed], column[keyed]
+                is_discrete = track.kinds[c] == "s"
+                if is_discrete:
+                    # Re-index interned values into a per-channel label table
+                    table = labels.setdefault(name, [])
+                    local = []
+                    for ident in knot_values.astype(int):
+                        label = track.table.name(ident)
+                        if label not in table:
+                            table.append(label)
+                        local.append(table.index(label))
+                    knot_values = np.asarray(local, dtype=np.float64)
+                channels.append(name)
+                knots.append((knot_times, knot_values))
+                discrete.append(is_discrete)
+        
+        if not channels:
+            return BakedAnimation(
+                name=animation.name, duration=animation.duration, fps=fps,
+                loop=animation.loop, channels=[], times=times,
+                values=np.zeros((0, frame_count)), events=list(animation.events)
+            )
+        
+        # Pad knots into (channels, max_knots) matrices; padded times are
+        # +inf so they never count as "passed", padded values repeat the last
+        width = max(len(kt) for kt, _ in knots)
+        knot_t = np.full((len(channels), width), np.inf)
+        knot_v = np.empty((len(channels), width))
+        counts = np.empty(len(channels), dtype=np.intp)
+        for row, (kt, kv) in enumerate(knots):
+            n = len(kt)
+            knot_t[row, :n] = kt
+            knot_v[row, :n] = kv
+            knot_v[row, n:] = kv[-1] if n else 0.0
+            counts[row] = n
+        
+        # Index of the last knot at or before each frame: (channels, frames)
+        idx = (knot_t[:, :, None] <= t[None, None, :]).sum(axis=1) - 1
+        seg = np.clip(idx, 0, np.maximum(counts - 2, 0)[:, None])
+        
+        t0 = np.take_along_axis(knot_t, seg, axis=1)
+        t1 = np.take_along_axis(knot_t, seg + 1, axis=1) if width > 1 else np.full_like(t0, np.inf)
+        v0 = np.take_along_axis(knot_v, seg, axis=1)
+        v1 = np.take_along_axis(knot_v, seg + 1, axis=1) if width > 1 else v0
+        
+        span = t1 - t0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            w = np.where(span > 0, (t[None, :] - t0) / span, 0.0)
+        w = np.clip(np.nan_to_num(w, nan=0.0, posinf=0.0), 0.0, 1.0)
+        values = v0 + (v1 - v0) * w
+        
+        # Discrete channels hold the last passed knot instead
+        held = np.take_along_axis(knot_v, np.maximum(idx, 0), axis=1)
+        values = np.where(np.asarray(discrete)[:, None], held, values)
+        
+        return BakedAnimation(
+            name=animation.name,
+            duration=animation.duration,
+            fps=fps,
+            loop=animation.loop,
+            channels=channels,
+            times=times,
+            values=values,
+            labels=labels,
+            events=list(animation.events),
+        )
+    
     def export_to_lottie(self, animation: Animation) -> dict:
         """Convert animation to Lottie JSON format."""
         fps = 30
@@ -621,9 +1510,8 @@ class AnimationEngine:
                 }
             }
             
-            for kf in track.keyframes:
-                frame = int(kf.time * total_frames)
-                value = list(kf.properties.values())[0]
+            for time, value in zip(track.times, track.first_values()):
+                frame = int(time * total_frames)
                 layer["ks"][track.property]["k"].append({
                     "t": frame,
                     "s": [value],
@@ -645,10 +1533,8 @@ class AnimationEngine:
         }
         
         for track in animation.tracks:
-            times = [kf.time * animation.duration for kf in track.keyframes]
-            values = []
-            for kf in track.keyframes:
-                values.extend(list(kf.properties.values()))
+            times = [time * animation.duration for time in track.times]
+            values = track.flat_values()
             
             clip["tracks"].append({
                 "name": f"{track.target}.{track.property}",
@@ -658,3 +1544,201 @@ class AnimationEngine:
             })
         
         return clip
+    
+    def export_to_packed(self, animation: Animation) -> bytes:
+        """
+        Export to the packed binary clip format (see PACKED_HEADER).
+        
+        Times are in seconds like the Three.js export. Discrete columns are
+        stored as indices into the track's label list in the meta block and
+        unkeyed values as NaN.
+        """
+        meta_tracks = []
+        buffers = []
+        for track in animation.tracks:
+            names = track.column_names
+            values = track.values_array().astype(np.float32)
+            labels = {}
+            for c, kind in enumerate(track.kinds):
+                if kind != "s":
+                    continue
+                column = values[:, c]
+                keyed = ~np.isnan(column)
+                idents = column[keyed].astype(int)
+                table = [track.table.name(i) for i in dict.fromkeys(idents.tolist())]
+                column[keyed] = [table.index(track.table.name(i)) for i in idents]
+                labels[names[c]] = table
+            
+            meta_tracks.append({
+                "name": f"{track.target}.{track.property}",
+                "columns": list(names),
+                "labels": labels,
+            })
+            times = (track.times_array() * animation.duration).astype("<f4")
+            buffers.append((len(track), track.width, times.tobytes(), values.astype("<f4").tobytes()))
+        
+        meta = json.dumps({
+            "name": animation.name,
+            "events": animation.events,
+            "tracks": meta_tracks,
+        }).encode("utf-8")
+        meta += b" " * (-len(meta) % 4)
+        
+        offset = PACKED_HEADER.size + len(meta) + PACKED_ENTRY.size * len(buffers)
+        directory = []
+        for count, width, times, values in buffers:
+            directory.append(PACKED_ENTRY.pack(count, width, 0, offset, offset + len(times)))
+            offset += len(times) + len(values)
+        
+        header = PACKED_HEADER.pack(
+            PACKED_MAGIC, PACKED_VERSION, 1 if animation.loop else 0,
+            len(buffers), animation.duration, len(meta)
+        )
+        return b"".join(
+            [header, meta]
+            + directory
+            + [chunk for _, _, times, values in buffers for chunk in (times, values)]
+        )
+
+    
+    def import_threejs(self, clip: dict) -> Animation:
+        """
+        Rebuild an Animation from an export_to_threejs clip.
+        
+        The Three.js format does not record property keys, so tracks wider
+        than one value get positional column names ("0", "1", ...).
+        """
+        duration = clip["duration"]
+        animation = Animation(name=clip["name"], duration=duration)
+        for data in clip["tracks"]:
+            target, _, prop = data["name"].partition(".")
+            count = len(data["times"])
+            width = len(data["values"]) // count if count else 1
+            names = [prop] if width == 1 else [str(i) for i in range(width)]
+            
+            kinds = []
+            table = PropertyTable()
+            values = list(data["values"])
+            for c in range(width):
+                column = values[c::width]
+                if any(isinstance(v, str) for v in column):
+                    kinds.append("s")
+                    values[c::width] = [table.intern(str(v)) for v in column]
+                elif all(isinstance(v, int) for v in column):
+                    kinds.append("i")
+                else:
+                    kinds.append("f")
+            
+            times = [t / duration for t in data["times"]] if duration else [0.0] * count
+            animation.tracks.append(AnimationTrack.from_columns(
+                target, prop, names, "".join(kinds), times, [float(v) for v in values], table=table
+            ))
+        return animation
+    
+    def import_packed(self, packed: "PackedClip") -> Animation:
+        """Rebuild an Animation from a packed clip (values widen back to float64)."""
+        animation = Animation(
+            name=packed.name, duration=packed.duration, loop=packed.loop, events=list(packed.events)
+        )
+        for i, info in enumerate(packed.tracks):
+            target, _, prop = info.name.partition(".")
+            values = packed.values(i).astype(np.float64)
+            table = PropertyTable()
+            kinds = []
+            for c, column_name in enumerate(info.columns):
+                labels = info.labels.get(column_name)
+                if labels is None:
+                    kinds.append("f")
+                    continue
+                kinds.append("s")
+                column = values[:, c]
+                keyed = ~np.isnan(column)
+                column[keyed] = [table.intern(labels[int(v)]) for v in column[keyed]]
+            
+            times = packed.times(i).astype(np.float64)
+            if packed.duration:
+                times /= packed.duration
+            animation.tracks.append(AnimationTrack.from_columns(
+                target, prop, info.columns, "".join(kinds), times, values.ravel(), table=table
+            ))
+        return animation
+
+
+class PackedClip:
+    """
+    Reader for packed clips. Track buffers are returned as zero-copy views
+    into the underlying buffer, which is an mmap when using `open()`.
+    Views must be released before `close()`.
+    """
+    
+    def __init__(self, buffer, mapping: Optional[mmap.mmap] = None):
+        self._buffer = memoryview(buffer)
+        self._mmap = mapping
+        
+        magic, version, flags, track_count, duration, meta_len = PACKED_HEADER.unpack_from(self._buffer, 0)
+        if magic != PACKED_MAGIC:
+            raise ValueError("Not a packed clip")
+        if version != PACKED_VERSION:
+            raise ValueError(f"Unsupported packed clip version: {version}")
+        
+        meta = json.loads(bytes(self._buffer[PACKED_HEADER.size:PACKED_HEADER.size + meta_len]))
+        self.name: str = meta["name"]
+        self.duration: float = duration
+        self.loop: bool = bool(flags & 1)
+        self.events: List[Dict] = meta["events"]
+        self.tracks: List[PackedTrackInfo] = []
+        
+        entry_offset = PACKED_HEADER.size + meta_len
+        for info in meta["tracks"]:
+            count, width, reserved, times_offset, values_offset = PACKED_ENTRY.unpack_from(self._buffer, entry_offset)
+            if reserved:
+                raise ValueError(f"Reserved field of packed track {info['name']!r} is not zero")
+            entry_offset += PACKED_ENTRY.size
+            self.tracks.append(PackedTrackInfo(
+                info["name"], info["columns"], info["labels"], count, width, times_offset, values_offset
+            ))
+    
+    @classmethod
+    def open(cls, path: str) -> "PackedClip":
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapping, mapping)
+    
+    def _index(self, track) -> int:
+        if isinstance(track, int):
+            return track
+        for i, info in enumerate(self.tracks):
+            if info.name == track:
+                return i
+        raise KeyError(track)
+    
+    def times(self, track) -> np.ndarray:
+        """Keyframe times (seconds) of a track, by index or name."""
+        info = self.tracks[self._index(track)]
+        return np.frombuffer(self._buffer, dtype="<f4", count=info.count, offset=info.times_offset)
+    
+    def values(self, track) -> np.ndarray:
+        """(keyframes, columns) values of a track, by index or name."""
+        info = self.tracks[self._index(track)]
+        flat = np.frombuffer(self._buffer, dtype="<f4", count=info.count * info.width, offset=info.values_offset)
+        return flat.reshape(info.count, info.width)
+    
+    def raw(self, track) -> tuple:
+        """(times, values) of a track as flat float32 memoryviews."""
+        info = self.tracks[self._index(track)]
+        times = self._buffer[info.times_offset:info.times_offset + 4 * info.count]
+        values = self._buffer[info.values_offset:info.values_offset + 4 * info.count * info.width]
+        if sys.byteorder == "little":
+            return times.cast("f"), values.cast("f")
+        return times, values  # Raw little-endian bytes
+    
+    def close(self):
+        self._buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
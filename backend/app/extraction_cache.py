@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from typing import Optional
+
+CacheStats = namedtuple("CacheStats", ["hits", "misses", "writes", "evictions", "entries"])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS extractions (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS extractions_accessed ON extractions (accessed_at);
+"""
+
+
+def extraction_key(dialogue: str, context: str, prompt_version: str, model: str) -> str:
+    """Content address of one extraction: any input that changes the answer changes the key."""
+    payload = json.dumps([prompt_version, model, context, dialogue], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """
+    Persistent SQLite cache of LLM action extractions.
+
+    Entries older than `ttl` seconds are treated as misses and dropped;
+    when `max_entries` is exceeded the least recently used entries are
+    evicted. With `cache_only=True` the parser never calls the model and
+    falls back to keyword extraction on a miss, which makes offline builds
+    reproducible from a warm cache.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        cache_only: bool = False,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache_only = cache_only
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def get(self, key: str) -> Optional[dict]:
+        """Cached extraction for key, or None on a miss or an expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM extractions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM extractions WHERE key = ?", (key,))
+                self._conn.commit()
+                self.evictions += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE extractions SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: dict):
+        """Store an extraction, evicting least recently used entries over max_entries."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extractions (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            self.writes += 1
+            if self.max_entries is not None:
+                cursor = self._conn.execute(
+                    "DELETE FROM extractions WHERE key IN ("
+                    "SELECT key FROM extractions ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                self.evictions += cursor.rowcount
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete every entry older than the TTL; returns the number removed."""
+        if self.ttl is None:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM extractions WHERE created_at < ?", (time.time() - self.ttl,)
+            )
+            self._conn.commit()
+            self.evictions += cursor.rowcount
+        return cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM extractions")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.writes, self.evictions, len(self))
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,79 @@
+"""
+Registry of action extractor backends.
+
+A backend is selected by name and built by a factory referenced as
+"module:attribute", so its dependencies (the Gemini SDK, NumPy models)
+are imported only when that backend is actually used. A factory returns
+either a model client (anything with generate_content or
+generate_content_async, used with the extraction prompt) or an offline
+extractor (anything with extract_batch(dialogues) -> list of action
+dicts).
+
+A factory whose dependencies or configuration (an SDK, an API key) are
+missing raises BackendUnavailable, so callers can fall back to keywords.
+"""
+
+import importlib
+import os
+
+class BackendUnavailable(ValueError):
+    """A backend's configuration is missing (e.g. no API key)."""
+
+
+# name -> "module:factory"
+EXTRACTOR_BACKENDS = {
+    "keyword": "extractor_backends:create_keyword_extractor",
+    "gemini": "extractor_backends:create_gemini_model",
+    "local": "extractor_backends:create_local_classifier",
+}
+
+
+def register_backend(name: str, target: str):
+    """Register (or replace) a backend factory given as "module:attribute"."""
+    if ":" not in target:
+        raise ValueError(f"Backend target must be 'module:attribute', got {target!r}")
+    EXTRACTOR_BACKENDS[name] = target
+
+
+def available_backends() -> list[str]:
+    return sorted(EXTRACTOR_BACKENDS)
+
+
+def default_backend(api_key: str = None) -> str:
+    """ACTION_EXTRACTOR if set, else gemini when an API key is available, else keyword."""
+    return os.getenv("ACTION_EXTRACTOR") or ("gemini" if api_key else "keyword")
+
+
+def load_backend(name: str, **options):
+    """Import and build the named backend; options are passed to its factory."""
+    try:
+        target = EXTRACTOR_BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown extractor backend {name!r} (available: {', '.join(available_backends())})"
+        ) from None
+    module_name, _, attribute = target.partition(":")
+    factory = getattr(importlib.import_module(module_name), attribute)
+    return factory(**options)
+
+
+def create_keyword_extractor(**options):
+    from gemini_action_parser import KeywordExtractor
+    return KeywordExtractor()
+
+
+def create_local_classifier(**options):
+    from local_classifier import train_local_classifier
+    return train_local_classifier()
+
+
+def create_gemini_model(api_key: str = None, model_name: str = None, **options):
+    api_key = api_key or os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise BackendUnavailable("The gemini extractor backend needs GEMINI_API_KEY")
+
+    import google.generativeai as genai
+    from gemini_action_parser import MODEL_NAME
+
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name or MODEL_NAME)
@@ -1,24 +1,271 @@
-import google.generativeai as genai
+import asyncio
 import json
 import os
+import sys
+import bisect
+import re
+import unicodedata
+from itertools import islice
+from typing import Iterator
+from animation_engine import ActionDescriptor
+from extraction_cache import ExtractionCache, extraction_key
+from extractor_backends import BackendUnavailable, default_backend, load_backend
+from rate_limit import TokenBucket, retry_async
 
-class GeminiActionParser:
-    def __init__(self, api_key: str = None):
-        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
-        if self.api_key:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
+MODEL_NAME = 'gemini-1.5-flash'
+# Bump whenever the extraction prompt changes so cached answers are not reused
+PROMPT_VERSION = "1"
+BATCH_PROMPT_VERSION = "batch-1"
+DEFAULT_BATCH_SIZE = 10
+
+# Fields that must be JSON arrays in an extraction when present
+LIST_FIELDS = ("sub_actions", "body_parts", "props", "special_effects")
+
+# Extraction fields that depend on the spoken language rather than the step,
+# with how each is derived from a translation's own dialogue (see
+# parse_aligned_storyboards)
+LANGUAGE_FIELDS = {
+    "mouth_sync": lambda dialogue: bool(dialogue.strip()),
+}
+
+# (markers in a "## " heading, character id, extraction context), with the
+# English and Marathi storyboard names of each character
+CHARACTER_HEADINGS = [
+    (("Luna", "Pari Tai", "परी ताई"), "luna", "gentle fairy for toddlers ages 1-4"),
+    (("Captain", "कॅप्टन"), "captain", "energetic hero for kids ages 5-11"),
+    (("Dr.", "डॉ."), "dr_bright", "professional doctor for teens ages 12-18"),
+]
+
+# Keyword fallback rules in priority order: when a dialogue mentions several
+# keywords the earliest rule wins. Forms are matched as whole words
+# (case-insensitive), so "top" no longer fires on "stop" and "45" no longer
+# fires on "145"; multi-word forms must appear as consecutive words.
+KEYWORD_RULES = [
+    (("pick up", "picks up", "picking up", "picked up"), {"primary_action": "pickup", "props": ["toothbrush"]}),
+    (("rinse", "rinses", "rinsed", "rinsing"), {"primary_action": "rinsing", "sub_actions": ["drink", "swish", "spit"]}),
+    (("swish", "swishes", "swished", "swishing"), {"primary_action": "swishing", "body_parts": ["cheeks", "mouth"]}),
+    (("spit", "spits", "spitting"), {"primary_action": "spitting", "body_parts": ["mouth"]}),
+    (("paste", "toothpaste"), {"primary_action": "applying_paste", "props": ["toothpaste", "toothbrush"]}),
+    (("roar", "roars", "roared", "roaring"), {"primary_action": "openMouth", "emotion": "playful"}),
+    (("open wide",), {"primary_action": "openMouth", "body_parts": ["mouth"]}),
+    (("bottom", "bottoms"), {"primary_action": "brushing", "sub_actions": ["brush_bottom_teeth"]}),
+    (("top", "tops"), {"primary_action": "brushing", "sub_actions": ["brush_top_teeth"]}),
+    (("front",), {"primary_action": "brushing", "sub_actions": ["brush_front_teeth"]}),
+    (("tongue", "tongues"), {"primary_action": "tongueOut", "sub_actions": ["brush_tongue"]}),
+    (("molar", "molars"), {"primary_action": "brushing", "sub_actions": ["brush_molars"]}),
+    (("wiggle", "wiggles", "wiggled", "wiggling"), {"primary_action": "brushing", "motion_type": "wiggle"}),
+    (("circular",), {"primary_action": "brushing", "motion_type": "circular"}),
+    (("angle", "angles", "angled", "angling"), {"primary_action": "brushing", "motion_type": "angled"}),
+    (("45",), {"primary_action": "brushing", "motion_type": "angled_45"}),
+    (("celebrate", "celebrates", "celebrated", "celebrating", "celebration"), {"primary_action": "celebrate", "emotion": "excited"}),
+    (("hooray",), {"primary_action": "celebrate", "special_effects": ["sparkles"]}),
+    (("wave", "waves", "waved", "waving"), {"primary_action": "wave", "body_parts": ["arm"]}),
+    (("morning", "mornings"), {"primary_action": "greeting", "emotion": "happy"}),
+    (("night", "nights", "tonight"), {"primary_action": "greeting", "emotion": "calm"}),
+]
+
+def _trie_pattern(words) -> str:
+    """Regex alternation for `words` factored into a prefix trie, so the
+    engine never re-tests a shared prefix ("rins" in rinse/rinsed/rinsing)."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    
+    def build(node) -> str:
+        branches = [re.escape(char) + build(node[char]) for char in sorted(node) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+    
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Matches all keyword rules in a single pass over a text.
+    
+    Every form of every rule is compiled into one word-bounded, trie-factored,
+    case-insensitive regex; the lowest-numbered (highest-priority) rule found
+    wins. Texts are matched as given rather than lowercased, since lower()
+    can change a text's length (e.g. "İ") and shift match offsets.
+    `match_many` scans a whole batch of dialogues with one finditer call.
+    """
+    
+    def __init__(self, rules: list):
+        self.rules = rules
+        self._rule_of = {}
+        for rule, (forms, _) in enumerate(rules):
+            for form in forms:
+                self._rule_of.setdefault(form.lower(), rule)
+        first_chars = "".join(sorted({form[0] for form in self._rule_of}))
+        self._pattern = re.compile(
+            rf"\b(?=[{re.escape(first_chars)}])(?:{_trie_pattern(self._rule_of)})\b",
+            re.IGNORECASE,
+        )
+    
+    def _rule(self, word: str) -> int:
+        """Rule of a matched word."""
+        rule = self._rule_of.get(word.lower())
+        if rule is None:
+            # A case match that lower() does not map back (e.g. "İ" for "i")
+            rule = next(
+                rule for form, rule in self._rule_of.items()
+                if len(form) == len(word) and re.fullmatch(re.escape(form), word, re.IGNORECASE)
+            )
+        return rule
+    
+    def match(self, text: str):
+        """Actions of the highest-priority rule found in text, or None."""
+        best = None
+        for m in self._pattern.finditer(text):
+            rule = self._rule(m.group())
+            if best is None or rule < best:
+                best = rule
+                if rule == 0:
+                    break
+        return self.rules[best][1] if best is not None else None
+    
+    def match_many(self, texts: list[str]) -> list:
+        """match() for every text, scanning the joined batch once."""
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        
+        best = [None] * len(texts)
+        joined = "\n".join(texts)
+        for m in self._pattern.finditer(joined):
+            i = bisect.bisect_right(starts, m.start()) - 1
+            rule = self._rule(m.group())
+            if best[i] is None or rule < best[i]:
+                best[i] = rule
+        return [self.rules[rule][1] if rule is not None else None for rule in best]
+
+
+KEYWORD_MATCHER = KeywordMatcher(KEYWORD_RULES)
+
+
+def _fallback_result(actions) -> dict:
+    result = {
+        "primary_action": "idle",
+        "sub_actions": [],
+        "body_parts": [],
+        "motion_type": "static",
+        "emotion": "neutral",
+        "duration_hint": "medium",
+        "props": [],
+        "mouth_sync": True,
+        "special_effects": []
+    }
+    if actions:
+        # Copy list values so results never share state with the rules
+        result.update({k: list(v) if isinstance(v, list) else v for k, v in actions.items()})
+    return result
+
+
+class FallbackActions(ActionDescriptor):
+    """
+    Actions from the offline fallback rather than the model, so callers
+    that keep results (e.g. incremental builds) can retry them once the
+    model is reachable. Compares and hashes like any descriptor.
+    """
+    __slots__ = ()
+
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _ascii_digits(text: str) -> str:
+    """Replace Unicode decimal digits (e.g. Devanagari "१२") with ASCII ones."""
+    return "".join(str(unicodedata.decimal(char)) if char.isdecimal() else char for char in text)
+
+
+def _language_actions(actions: ActionDescriptor, dialogue: str) -> ActionDescriptor:
+    """A translation's copy of shared actions, with each of LANGUAGE_FIELDS derived from its own dialogue."""
+    return actions.replace(**{field: derive(dialogue) for field, derive in LANGUAGE_FIELDS.items()})
+
+
+def source_names(sources: list) -> list[str]:
+    """
+    A distinct name per storyboard source: the file stem ("stdin" for "-",
+    the stream's name if any, else "source"), suffixed with its position
+    when two sources would share a name.
+    """
+    names = []
+    for source in sources:
+        if source == "-":
+            name = "stdin"
         else:
-            self.model = None
+            path = getattr(source, "name", source)
+            name = os.path.splitext(os.path.basename(path))[0] if isinstance(path, str) else "source"
+        names.append(re.sub(r"\W+", "_", name) or "source")
+    return [name if names.count(name) == 1 else f"{name}{i + 1}" for i, name in enumerate(names)]
+
+
+def _scene_requests(scenes: list[dict]) -> list[tuple]:
+    """(dialogue, context) extraction requests for parsed storyboard rows."""
+    return [(scene["dialogue"], f"{scene['character']}: {scene['step_name']}") for scene in scenes]
+
+
+def _valid_actions(entry) -> bool:
+    """True if a model-produced entry has the shape the animation engine expects."""
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("primary_action"), str)
+        and all(isinstance(entry.get(field, []), list) for field in LIST_FIELDS)
+    )
+
+
+class KeywordExtractor:
+    """Offline extractor backed by KEYWORD_RULES (the "keyword" backend)."""
+    
+    def __init__(self, matcher: KeywordMatcher = KEYWORD_MATCHER):
+        self.matcher = matcher
     
-    def extract_actions_from_dialogue(self, dialogue: str, context: str = "") -> dict:
+    def extract_batch(self, dialogues: list[str]) -> list[dict]:
+        return [_fallback_result(actions) for actions in self.matcher.match_many(dialogues)]
+
+
+class GeminiActionParser:
+    def __init__(self, api_key: str = None, cache: ExtractionCache = None, backend: str = None):
         """
-        Uses Gemini to understand the dialogue and extract animation actions.
+        backend names an entry of extractor_backends.EXTRACTOR_BACKENDS
+        (default: ACTION_EXTRACTOR, else gemini with an API key, else
+        keyword). A model backend is asked with the extraction prompt; an
+        offline backend replaces the keyword fallback. The Gemini SDK is
+        only imported when the gemini backend is selected; if it or the
+        API key is missing the parser falls back to keywords unless the
+        backend was asked for explicitly.
         """
-        if not self.model:
-            return self._fallback_extraction(dialogue)
+        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        self.cache = cache
+        self.model = None
+        self.extractor = KeywordExtractor()
+        self.backend = backend or default_backend(self.api_key)
+        
+        try:
+            loaded = load_backend(self.backend, api_key=self.api_key)
+        except (ImportError, BackendUnavailable) as e:
+            if backend is not None:
+                raise
+            print(f"⚠️  {self.backend} extractor unavailable ({e}); using keyword fallback")
+            self.backend = "keyword"
+            return
         
-        prompt = f"""
+        if hasattr(loaded, "extract_batch"):
+            self.extractor = loaded
+        else:
+            self.model = loaded
+    
+    def _build_prompt(self, dialogue: str, context: str) -> str:
+        return f"""
         Analyze this dialogue from a dental hygiene avatar app and extract animation instructions.
         
         Context: {context}
@@ -39,91 +286,449 @@ class GeminiActionParser:
         
         Only return valid JSON, no explanation.
         """
+    
+    def _parse_response(self, text: str):
+        text = text.strip()
+        # Clean markdown code blocks if present
+        if text.startswith("```"):
+            text = text.split("```")[1]
+            if text.startswith("json"):
+                text = text[4:]
+        return json.loads(text)
+    
+    def _build_batch_prompt(self, requests: list[tuple]) -> str:
+        lines = "\n".join(
+            f'{i}. Context: {context}\n   Dialogue: "{dialogue}"'
+            for i, (dialogue, context) in enumerate(requests, 1)
+        )
+        return f"""
+        Analyze each numbered dialogue from a dental hygiene avatar app and extract animation instructions.
+        
+        {lines}
+        
+        Return a JSON array with exactly {len(requests)} objects, one per dialogue in the same order, each with:
+        {{
+            "primary_action": "main animation action",
+            "sub_actions": ["list", "of", "sequential", "sub-actions"],
+            "body_parts": ["mouth", "arm", "tongue", etc.],
+            "motion_type": "circular|linear|wave|static",
+            "emotion": "happy|excited|calm|encouraging",
+            "duration_hint": "short|medium|long",
+            "props": ["toothbrush", "cup", "paste", etc.],
+            "mouth_sync": true/false,
+            "special_effects": ["sparkles", "bubbles", etc.]
+        }}
         
+        Only return valid JSON, no explanation.
+        """
+    
+    def _parse_batch_response(self, text: str, count: int) -> list:
+        """
+        Entries of a batch response, padded or cut to `count`; malformed
+        entries become None. Raises ValueError if the response is not a
+        JSON array at all.
+        """
+        entries = self._parse_response(text)
+        if not isinstance(entries, list):
+            raise ValueError(f"Expected a JSON array, got {type(entries).__name__}")
+        entries = entries[:count] + [None] * (count - len(entries))
+        return [entry if _valid_actions(entry) else None for entry in entries]
+    
+    def _finish_batch(self, requests: list[tuple], keys: list, entries: list) -> list[ActionDescriptor]:
+        """Cache the valid entries and fall back to keywords for the rest (in one extractor pass)."""
+        results = [None if entry is None else self._store(key, entry) for key, entry in zip(keys, entries)]
+        self._fill_fallbacks(requests, results, [i for i, entry in enumerate(entries) if entry is None])
+        return results
+    
+    def _cached(self, dialogue: str, context: str, prompt_version: str) -> tuple:
+        """(cache key, cached result or None, whether a miss should go to the model)."""
+        key = None
+        if self.cache is not None:
+            key = extraction_key(dialogue, context, prompt_version, MODEL_NAME)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return key, ActionDescriptor(cached), False
+        return key, None, self.model_available
+    
+    def _lookup(self, dialogue: str, context: str, prompt_version: str = PROMPT_VERSION) -> tuple:
+        """
+        (cache key, result) before calling the model. The result is a cached
+        answer, a keyword fallback when the model must not be called, or
+        None when the model should be asked.
+        """
+        key, result, ask = self._cached(dialogue, context, prompt_version)
+        if result is None and not ask:
+            result = self._fallback_extraction(dialogue)
+        return key, result
+    
+    def _store(self, key: str, action_data: dict) -> ActionDescriptor:
+        """Descriptor of a model answer, caching the answer as JSON."""
+        result = ActionDescriptor(action_data)
+        if key is not None:
+            self.cache.put(key, action_data)
+        return result
+    
+    def extract_actions_from_dialogue(self, dialogue: str, context: str = "") -> ActionDescriptor:
+        """
+        Uses Gemini to understand the dialogue and extract animation actions.
+        
+        Model answers, cached answers and fallbacks are all normalized into
+        an ActionDescriptor.
+        
+        With a cache, earlier Gemini answers for the same dialogue, context,
+        prompt version and model are reused even when no API key is set;
+        keyword fallbacks are never cached.
+        """
+        key, result = self._lookup(dialogue, context)
+        if result is not None:
+            return result
+        return self._extract(dialogue, context, key)
+    
+    def _extract(self, dialogue: str, context: str, key: str) -> ActionDescriptor:
+        """Ask the model about one dialogue that missed the cache."""
+        try:
+            response = self.model.generate_content(self._build_prompt(dialogue, context))
+            return self._store(key, self._parse_response(response.text))
+        except Exception as e:
+            print(f"Gemini parsing failed: {e}")
+            return self._fallback_extraction(dialogue)
+    
+    def extract_actions_batch(self, requests: list[tuple], batch_size: int = DEFAULT_BATCH_SIZE) -> list[ActionDescriptor]:
+        """
+        Extract actions for many (dialogue, context) pairs, packing up to
+        `batch_size` uncached dialogues into each model request. Entries
+        of the returned array are validated one by one, so only malformed
+        entries fall back to keyword extraction. Results are in input order.
+        """
+        results, pending = self._batch_lookup(requests)
+        for chunk in _chunks(pending, max(1, batch_size)):
+            items = [requests[i] for i, _ in chunk]
+            try:
+                response = self.model.generate_content(self._build_batch_prompt(items))
+                entries = self._parse_batch_response(response.text, len(items))
+            except Exception as e:
+                print(f"Gemini batch parsing failed: {e}")
+                entries = [None] * len(items)
+            for (i, _), result in zip(chunk, self._finish_batch(items, [key for _, key in chunk], entries)):
+                results[i] = result
+        return results
+    
+    def _batch_lookup(self, requests: list[tuple], prompt_version: str = BATCH_PROMPT_VERSION) -> tuple:
+        """
+        (results with cached/fallback answers filled in, [(index, cache key)]
+        still to ask). Misses the model must not see are classified together
+        in one fallback_extraction_batch call.
+        """
+        results = [None] * len(requests)
+        pending = []
+        offline = []
+        for i, (dialogue, context) in enumerate(requests):
+            key, results[i], ask = self._cached(dialogue, context, prompt_version)
+            if results[i] is not None:
+                continue
+            if ask:
+                pending.append((i, key))
+            else:
+                offline.append(i)
+        self._fill_fallbacks(requests, results, offline)
+        return results, pending
+    
+    def _fill_fallbacks(self, requests: list[tuple], results: list, indices: list):
+        """Set results[i] for each index to the offline fallback of requests[i]."""
+        if indices:
+            fallbacks = self.fallback_extraction_batch([requests[i][0] for i in indices])
+            for i, result in zip(indices, fallbacks):
+                results[i] = result
+    
+    async def _generate_async(self, prompt: str, limiter: TokenBucket = None) -> str:
+        """
+        Response text from the model. Any client with generate_content_async
+        or generate_content (run in a worker thread) can stand in for Gemini.
+        """
+        if limiter is not None:
+            await limiter.acquire()
+        generate_async = getattr(self.model, "generate_content_async", None)
+        if generate_async is not None:
+            response = await generate_async(prompt)
+        else:
+            response = await asyncio.to_thread(self.model.generate_content, prompt)
+        return response.text
+    
+    async def extract_actions_async(
+        self,
+        dialogue: str,
+        context: str = "",
+        limiter: TokenBucket = None,
+        retries: int = 3,
+        backoff: float = 0.5,
+    ) -> ActionDescriptor:
+        """
+        Async extract_actions_from_dialogue: model calls go through the rate
+        limiter and are retried with jittered exponential backoff before
+        falling back to keyword extraction.
+        """
+        key, result = self._lookup(dialogue, context)
+        if result is not None:
+            return result
+        return await self._extract_async(dialogue, context, key, limiter, retries, backoff)
+    
+    async def _extract_async(
+        self,
+        dialogue: str,
+        context: str,
+        key: str,
+        limiter: TokenBucket = None,
+        retries: int = 3,
+        backoff: float = 0.5,
+    ) -> ActionDescriptor:
+        """Ask the model about one dialogue that missed the cache (see extract_actions_async)."""
+        prompt = self._build_prompt(dialogue, context)
         try:
-            response = self.model.generate_content(prompt)
-            text = response.text.strip()
-            # Clean markdown code blocks if present
-            if text.startswith("```"):
-                text = text.split("```")[1]
-                if text.startswith("json"):
-                    text = text[4:]
-            return json.loads(text)
+            text = await retry_async(lambda: self._generate_async(prompt, limiter), retries, backoff)
+            return self._store(key, self._parse_response(text))
         except Exception as e:
             print(f"Gemini parsing failed: {e}")
             return self._fallback_extraction(dialogue)
     
-    def _fallback_extraction(self, dialogue: str) -> dict:
-        """Keyword-based fallback when Gemini is unavailable."""
-        dialogue_lower = dialogue.lower()
-        
-        action_map = {
-            "pick up": {"primary_action": "pickup", "props": ["toothbrush"]},
-            "rinse": {"primary_action": "rinsing", "sub_actions": ["drink", "swish", "spit"]},
-            "swish": {"primary_action": "swishing", "body_parts": ["cheeks", "mouth"]},
-            "spit": {"primary_action": "spitting", "body_parts": ["mouth"]},
-            "paste": {"primary_action": "applying_paste", "props": ["toothpaste", "toothbrush"]},
-            "roar": {"primary_action": "openMouth", "emotion": "playful"},
-            "open wide": {"primary_action": "openMouth", "body_parts": ["mouth"]},
-            "bottom": {"primary_action": "brushing", "sub_actions": ["brush_bottom_teeth"]},
-            "top": {"primary_action": "brushing", "sub_actions": ["brush_top_teeth"]},
-            "front": {"primary_action": "brushing", "sub_actions": ["brush_front_teeth"]},
-            "tongue": {"primary_action": "tongueOut", "sub_actions": ["brush_tongue"]},
-            "molar": {"primary_action": "brushing", "sub_actions": ["brush_molars"]},
-            "wiggle": {"primary_action": "brushing", "motion_type": "wiggle"},
-            "circular": {"primary_action": "brushing", "motion_type": "circular"},
-            "angle": {"primary_action": "brushing", "motion_type": "angled"},
-            "45": {"primary_action": "brushing", "motion_type": "angled_45"},
-            "celebrate": {"primary_action": "celebrate", "emotion": "excited"},
-            "hooray": {"primary_action": "celebrate", "special_effects": ["sparkles"]},
-            "wave": {"primary_action": "wave", "body_parts": ["arm"]},
-            "morning": {"primary_action": "greeting", "emotion": "happy"},
-            "night": {"primary_action": "greeting", "emotion": "calm"},
-        }
-        
-        result = {
-            "primary_action": "idle",
-            "sub_actions": [],
-            "body_parts": [],
-            "motion_type": "static",
-            "emotion": "neutral",
-            "duration_hint": "medium",
-            "props": [],
-            "mouth_sync": True,
-            "special_effects": []
-        }
-        
-        for keyword, actions in action_map.items():
-            if keyword in dialogue_lower:
-                result.update(actions)
-                break
+    async def extract_actions_many_async(
+        self,
+        requests: list[tuple],
+        concurrency: int = 8,
+        rate: float = None,
+        retries: int = 3,
+        batch_size: int = 1,
+        limiter: TokenBucket = None,
+    ) -> list[ActionDescriptor]:
+        """
+        Extract actions for many (dialogue, context) pairs with at most
+        `concurrency` model calls in flight and at most `rate` calls per
+        second. With batch_size > 1 each call carries up to `batch_size`
+        dialogues (see extract_actions_batch). Results are in input order.
+        Pass a limiter to share one rate limit across several calls.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        if limiter is None and rate:
+            limiter = TokenBucket(rate)
         
-        return result
+        if batch_size <= 1:
+            results, pending = self._batch_lookup(requests, PROMPT_VERSION)
+            
+            async def extract(i, key):
+                dialogue, context = requests[i]
+                async with semaphore:
+                    results[i] = await self._extract_async(dialogue, context, key, limiter, retries)
+            
+            await asyncio.gather(*(extract(i, key) for i, key in pending))
+            return results
+        
+        results, pending = self._batch_lookup(requests)
+        
+        async def extract_batch(chunk):
+            items = [requests[i] for i, _ in chunk]
+            prompt = self._build_batch_prompt(items)
+            
+            async def call():
+                # A response that is not an array at all is worth a retry
+                return self._parse_batch_response(await self._generate_async(prompt, limiter), len(items))
+            
+            async with semaphore:
+                try:
+                    entries = await retry_async(call, retries)
+                except Exception as e:
+                    print(f"Gemini batch parsing failed: {e}")
+                    entries = [None] * len(items)
+            for (i, _), result in zip(chunk, self._finish_batch(items, [key for _, key in chunk], entries)):
+                results[i] = result
+        
+        await asyncio.gather(*(extract_batch(chunk) for chunk in _chunks(pending, batch_size)))
+        return results
+    
+    @property
+    def model_available(self) -> bool:
+        """Whether cache misses are sent to the model rather than the offline fallback."""
+        return self.model is not None and not (self.cache is not None and self.cache.cache_only)
+    
+    def _fallback_extraction(self, dialogue: str) -> ActionDescriptor:
+        """Offline (keyword by default) fallback when Gemini is unavailable."""
+        return FallbackActions(self.extractor.extract_batch([dialogue])[0])
+    
+    def fallback_extraction_batch(self, dialogues: list[str]) -> list[ActionDescriptor]:
+        """Offline fallback for many dialogues in a single extractor pass."""
+        return [FallbackActions(actions) for actions in self.extractor.extract_batch(dialogues)]
 
-    def parse_full_storyboard(self, filepath: str) -> list[dict]:
-        """Parse entire storyboard with Gemini understanding."""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+    def parse_full_storyboard(
+        self,
+        filepath: str,
+        concurrency: int = 1,
+        rate: float = None,
+        batch_size: int = 1,
+    ) -> list[dict]:
+        """
+        Parse entire storyboard with Gemini understanding.
+        
+        With concurrency > 1 up to that many model calls run at once (see
+        extract_actions_many_async); with batch_size > 1 each model call
+        covers up to batch_size rows.
+        """
+        scenes = list(self.iter_rows(filepath))
+        self.attach_actions(scenes, concurrency, rate, batch_size)
+        return scenes
+    
+    async def parse_full_storyboard_async(
+        self,
+        filepath: str,
+        concurrency: int = 8,
+        rate: float = None,
+        batch_size: int = 1,
+    ) -> list[dict]:
+        """parse_full_storyboard with bounded-concurrency, rate-limited extraction."""
+        scenes = list(self.iter_rows(filepath))
+        actions = await self.extract_actions_many_async(
+            _scene_requests(scenes),
+            concurrency=concurrency,
+            rate=rate,
+            batch_size=batch_size,
+        )
+        for scene, action_data in zip(scenes, actions):
+            scene["actions"] = action_data
+        return scenes
+    
+    def parse_aligned_storyboards(self, storyboards: dict, primary: str = "en", **extract_options) -> dict:
+        """
+        Parse translations of one storyboard ({language: path or stream}) into
+        {language: scenes}, extracting actions once per step from the primary
+        language and copying them (bar LANGUAGE_FIELDS) to the aligned rows.
+        """
+        if primary not in storyboards:
+            raise ValueError(f"Primary language {primary!r} is not among {sorted(storyboards)}")
         
-        scenes = []
-        lines = content.split('\n')
+        scenes = {language: list(self.iter_all_rows(source)) for language, source in storyboards.items()}
+        primary_steps = {scene["id"]: scene for scene in scenes[primary]}
+        unaligned = [
+            scene
+            for language, rows in scenes.items() if language != primary
+            for scene in rows if scene["id"] not in primary_steps
+        ]
+        self.attach_actions(scenes[primary] + unaligned, **extract_options)
+        
+        for language, rows in scenes.items():
+            if language == primary:
+                continue
+            for scene in rows:
+                source = primary_steps.get(scene["id"])
+                if source is not None:
+                    scene["actions"] = _language_actions(source["actions"], scene["dialogue"])
+        return scenes
+    
+    def iter_storyboard(
+        self,
+        path_or_stream,
+        concurrency: int = 1,
+        rate: float = None,
+        batch_size: int = 1,
+        window: int = None,
+    ) -> Iterator[dict]:
+        """
+        Yield scenes with extracted actions as storyboard rows are parsed.
+        
+        path_or_stream is a path, "-" for stdin, an open text stream, or a
+        list of those read one after another. Rows are extracted in
+        windows of `window` rows (default concurrency * batch_size), so
+        only one window of scenes is held at a time. With concurrency > 1
+        every window runs on one event loop with one rate limiter, so the
+        rate limit holds across windows.
+        """
+        window = window or max(1, concurrency) * max(1, batch_size)
+        rows = self.iter_all_rows(path_or_stream)
+        loop = asyncio.new_event_loop() if concurrency > 1 else None
+        try:
+            limiter = TokenBucket(rate) if loop is not None and rate else None
+            while True:
+                scenes = list(islice(rows, window))
+                if not scenes:
+                    return
+                self.attach_actions(scenes, concurrency, rate, batch_size, loop=loop, limiter=limiter)
+                yield from scenes
+        finally:
+            if loop is not None:
+                loop.close()
+    
+    def attach_actions(
+        self,
+        scenes: list[dict],
+        concurrency: int = 1,
+        rate: float = None,
+        batch_size: int = 1,
+        loop: asyncio.AbstractEventLoop = None,
+        limiter: TokenBucket = None,
+    ):
+        """
+        Fill in "actions" for parsed rows using the requested extraction mode.
+        
+        Concurrent extraction runs on `loop` if given (else a fresh one)
+        and through `limiter` if given (else a new one for `rate`).
+        """
+        requests = _scene_requests(scenes)
+        if concurrency > 1:
+            extraction = self.extract_actions_many_async(
+                requests, concurrency=concurrency, rate=rate, batch_size=batch_size, limiter=limiter
+            )
+            actions = loop.run_until_complete(extraction) if loop is not None else asyncio.run(extraction)
+        elif batch_size > 1:
+            actions = self.extract_actions_batch(requests, batch_size)
+        else:
+            # Get AI-powered action analysis; offline misses are classified in one batch
+            actions, pending = self._batch_lookup(requests, PROMPT_VERSION)
+            for i, key in pending:
+                actions[i] = self._extract(*requests[i], key)
+        for scene, action_data in zip(scenes, actions):
+            scene["actions"] = action_data
+    
+    def iter_all_rows(self, path_or_stream) -> Iterator[dict]:
+        """
+        iter_rows over one source or a list of sources, in order.
+        
+        With more than one source each scene id is prefixed with its
+        source's name (see source_names), since step ids only identify a
+        row within one storyboard.
+        """
+        sources = path_or_stream if isinstance(path_or_stream, (list, tuple)) else [path_or_stream]
+        if len(sources) == 1:
+            yield from self.iter_rows(sources[0])
+            return
+        for name, source in zip(source_names(sources), sources):
+            for scene in self.iter_rows(source):
+                scene["id"] = f"{name}_{scene['id']}"
+                yield scene
+    
+    def iter_rows(self, source) -> Iterator[dict]:
+        """
+        Scene dicts (with "actions" still None) for each table row of one
+        storyboard, read line by line: a path, "-" for stdin, or a text stream.
+        """
+        if hasattr(source, "read"):
+            yield from self._rows_from_lines(source)
+        elif source == "-":
+            yield from self._rows_from_lines(sys.stdin)
+        else:
+            with open(source, 'r', encoding='utf-8') as f:
+                yield from self._rows_from_lines(f)
+    
+    def _rows_from_lines(self, lines) -> Iterator[dict]:
         current_character = None
         current_context = ""
+        has_animation_column = True
         
         for line in lines:
             line = line.strip()
             
             # Track character context
             if line.startswith("## "):
-                if "Luna" in line:
-                    current_character = "luna"
-                    current_context = "gentle fairy for toddlers ages 1-4"
-                elif "Captain" in line:
-                    current_character = "captain"
-                    current_context = "energetic hero for kids ages 5-11"
-                elif "Dr." in line:
-                    current_character = "dr_bright"
-                    current_context = "professional doctor for teens ages 12-18"
+                for markers, character, context in CHARACTER_HEADINGS:
+                    if any(marker in line for marker in markers):
+                        current_character = character
+                        current_context = context
+                        break
                 continue
             
             # Parse table rows
@@ -131,11 +736,20 @@ class GeminiActionParser:
                 parts = [p.strip() for p in line.split('|') if p.strip()]
                 if len(parts) >= 4:
                     try:
-                        step_num = parts[0]
+                        step_num = _ascii_digits(parts[0])
                         step_name = parts[1]
-                        duration = parts[2]
-                        animation_hint = parts[3]
-                        dialogue = parts[4] if len(parts) > 4 else ""
+                        duration = _ascii_digits(parts[2])
+                        
+                        # Header rows tell whether this table has an animation column
+                        if step_num == "#":
+                            has_animation_column = len(parts) >= 5
+                        
+                        if has_animation_column:
+                            animation_hint = parts[3]
+                            dialogue = parts[4] if len(parts) > 4 else ""
+                        else:
+                            animation_hint = ""
+                            dialogue = parts[3]
                         
                         # Skip headers
                         if "Step" in step_num or "---" in step_num or "#" in step_num:
@@ -144,29 +758,20 @@ class GeminiActionParser:
                         # Parse duration
                         duration_seconds = self._parse_duration(duration)
                         
-                        # Get AI-powered action analysis
-                        action_data = self.extract_actions_from_dialogue(
-                            dialogue, 
-                            context=f"{current_character}: {step_name}"
-                        )
-                        
-                        scenes.append({
+                        yield {
                             "id": f"{current_character}_{step_num}",
                             "character": current_character,
                             "step_name": step_name,
                             "dialogue": dialogue,
                             "animation_hint": animation_hint,
                             "duration": duration_seconds,
-                            "actions": action_data,
+                            "actions": None,
                             "context": current_context
-                        })
+                        }
                     except (IndexError, ValueError):
                         continue
-        
-        return scenes
     
     def _parse_duration(self, duration_str: str) -> float:
         """Extract seconds from duration string like '5s' or '20s'."""
-        import re
         match = re.search(r'(\d+)', duration_str)
         return float(match.group(1)) if match else 5.0
@@ -1,94 +1,502 @@
+import hashlib
 import json
 import os
-from gemini_action_parser import GeminiActionParser
-from animation_engine import AnimationEngine
+import shutil
+import tempfile
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from gemini_action_parser import DEFAULT_BATCH_SIZE, PROMPT_VERSION, FallbackActions, GeminiActionParser
+from extraction_cache import ExtractionCache
+from extractor_backends import available_backends
+from animation_engine import ActionDescriptor, AnimationEngine, PackedClip
+
+_worker_engine = None
+
+# Bump when the state file layout or the clip generation changes
+BUILD_STATE_VERSION = 2
+
+# Below this many clips per worker a process pool costs more than it saves
+MIN_CLIPS_PER_JOB = 32
+
+# mkstemp creates files as 0600; renamed files get the usual rw-r--r--
+ATOMIC_FILE_MODE = 0o644
+
+
+@contextmanager
+def _open_atomic(path: str, mode: str = 'w'):
+    """
+    Open a temp file next to `path` that is renamed into place when the
+    block exits cleanly and removed if it raises, so `path` never holds
+    a partial write.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        os.fchmod(fd, ATOMIC_FILE_MODE)
+        with os.fdopen(fd, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _contiguous(characters) -> bool:
+    """Whether equal characters in the sequence all sit next to each other."""
+    seen = set()
+    current = None
+    for char in characters:
+        if char != current:
+            if char in seen:
+                return False
+            seen.add(char)
+            current = char
+    return True
+
+
+def _write_atomic(path: str, data: bytes):
+    """Write to a temp file next to `path` and rename it into place."""
+    with _open_atomic(path, 'wb') as f:
+        f.write(data)
+
+
+def _export_clip_data(engine: AnimationEngine, scene_id: str, anim, format: str) -> tuple:
+    """(filename, file bytes, extra manifest fields) for one clip."""
+    entry = {}
+    if format == "packed":
+        data = engine.export_to_packed(anim)
+        filename = f"{scene_id}.tbpk"
+        
+        # Byte ranges let clients fetch single tracks with Range requests
+        entry["tracks"] = [
+            {
+                "name": info.name,
+                "columns": info.columns,
+                "width": info.width,
+                "times": [info.times_offset, 4 * info.count],
+                "values": [info.values_offset, 4 * info.count * info.width],
+            }
+            for info in PackedClip(data).tracks
+        ]
+    else:
+        if format == "lottie":
+            clip = engine.export_to_lottie(anim)
+        else:
+            clip = engine.export_to_threejs(anim)
+        data = json.dumps(clip, indent=2).encode()
+        filename = f"{scene_id}.json"
+    return filename, data, entry
+
+
+def _export_clip(task) -> tuple:
+    """Export and write one clip; returns (scene_id, manifest entry). Runs in pool workers."""
+    global _worker_engine
+    scene_id, anim, format, output_dir = task
+    if _worker_engine is None:
+        _worker_engine = AnimationEngine(cache_size=0)
+    
+    filename, data, entry = _export_clip_data(_worker_engine, scene_id, anim, format)
+    _write_atomic(os.path.join(output_dir, filename), data)
+    
+    return scene_id, {
+        "file": filename,
+        "duration": anim.duration,
+        "loop": anim.loop,
+        **entry
+    }
+
+
+def _fingerprint(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+def _read_bytes(path: str):
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _write_if_changed(path: str, data: bytes) -> bool:
+    """Write atomically unless the file already holds exactly `data`."""
+    if _read_bytes(path) == data:
+        return False
+    _write_atomic(path, data)
+    return True
+
 
 class AnimationGenerator:
-    def __init__(self, gemini_api_key: str = None):
-        self.parser = GeminiActionParser(gemini_api_key)
-        self.engine = AnimationEngine()
+    def __init__(
+        self,
+        gemini_api_key: str = None,
+        cache: ExtractionCache = None,
+        parser: GeminiActionParser = None,
+        engine: AnimationEngine = None,
+        backend: str = None,
+    ):
+        self.parser = parser or GeminiActionParser(gemini_api_key, cache=cache, backend=backend)
+        self.engine = engine or AnimationEngine()
         self.scenes = []
         self.animations = {}
     
-    def process_storyboard(self, storyboard_path: str):
-        """Full pipeline: parse -> generate -> export."""
-        print(f"📖 Parsing storyboard: {storyboard_path}")
-        self.scenes = self.parser.parse_full_storyboard(storyboard_path)
-        print(f"   Found {len(self.scenes)} scenes")
+    def process_storyboard(
+        self,
+        storyboard_path,
+        concurrency: int = 1,
+        rate: float = None,
+        batch_size: int = 1,
+    ):
+        """
+        Full pipeline: parse -> generate -> export.
         
-        print("🎬 Generating animations...")
-        for scene in self.scenes:
-            anim = self.engine.generate_animation(
-                scene["actions"],
-                scene["duration"]
-            )
-            anim.name = scene["id"]
+        storyboard_path may be anything iter_storyboard accepts (a path,
+        "-" for stdin, a stream, or a list of them). concurrency and rate
+        bound the in-flight model calls and calls per second during action
+        extraction; batch_size packs that many rows into each model call.
+        """
+        print(f"📖 Parsing storyboard: {storyboard_path}")
+        self.scenes = []
+        for scene, anim in self.iter_animations(
+            storyboard_path, concurrency=concurrency, rate=rate, batch_size=batch_size
+        ):
+            self.scenes.append(scene)
             self.animations[scene["id"]] = anim
             print(f"   ✓ {scene['id']}: {scene['actions'].get('primary_action')}")
+        print(f"   Found {len(self.scenes)} scenes")
         
+        self._print_cache_stats()
         return self.animations
     
-    def export_all(self, output_dir: str, format: str = "lottie"):
-        """Export all animations to files."""
-        os.makedirs(output_dir, exist_ok=True)
+    def process_translations(self, storyboards: dict, primary: str = "en", **extract_options) -> dict:
+        """
+        Process translations of one storyboard ({language: path}) with
+        actions extracted once per step (see parse_aligned_storyboards).
+        
+        This generator takes the primary language; every other language
+        gets its own generator sharing this parser and engine, so identical
+        actions also share animation templates. Returns {language: generator},
+        each ready for export_all / export_combined_timeline.
+        """
+        print(f"📖 Parsing aligned storyboards: {', '.join(f'{lang}={path}' for lang, path in storyboards.items())}")
+        aligned = self.parser.parse_aligned_storyboards(storyboards, primary, **extract_options)
+        
+        generators = {}
+        for language, scenes in aligned.items():
+            generator = self if language == primary else AnimationGenerator(parser=self.parser, engine=self.engine)
+            generator.scenes = scenes
+            generator.animations = {scene["id"]: generator._generate(scene) for scene in scenes}
+            generators[language] = generator
+            print(f"   {language}: {len(scenes)} scenes")
         
+        self._print_cache_stats()
+        return generators
+    
+    def iter_animations(self, storyboard_path, **extract_options):
+        """
+        Yield (scene, animation) as storyboard rows are parsed and extracted,
+        so parsing, extraction and clip generation overlap instead of
+        running as separate passes over the whole storyboard.
+        """
+        for scene in self.parser.iter_storyboard(storyboard_path, **extract_options):
+            yield scene, self._generate(scene)
+    
+    def stream_storyboard(
+        self,
+        storyboard_path,
+        output_dir: str,
+        format: str = "threejs",
+        timeline_path: str = None,
+        simplify: bool = False,
+        **extract_options
+    ) -> dict:
+        """
+        Parse, extract, generate and export scene by scene.
+        
+        Each clip is written as soon as it is generated and the combined
+        timeline (if timeline_path is given) is streamed alongside it, so
+        memory is bounded by one extraction window plus the manifest
+        rather than the whole storyboard. self.scenes and self.animations
+        are left untouched. With simplify=True each clip goes through
+        engine.simplify before export. Returns the manifest.
+        
+        Storyboard files are checked up front; if a character's scenes are
+        split (e.g. across language files), or the input cannot be read
+        twice, each character's timeline block is spilled to its own temp
+        file and concatenated at the end. The timeline is written to a temp
+        file and only replaces timeline_path once it is complete.
+        """
+        spill = bool(timeline_path) and not self._is_contiguous(storyboard_path)
+        if spill:
+            print("ℹ️  Characters are not contiguous; spilling timeline blocks per character")
+        os.makedirs(output_dir, exist_ok=True)
         manifest = {
             "version": "1.0",
             "format": format,
             "animations": {}
         }
         
+        def exported():
+            for scene, anim in self.iter_animations(storyboard_path, **extract_options):
+                if simplify:
+                    anim = self.engine.simplify(anim)
+                scene_id, entry = _export_clip((scene["id"], anim, format, output_dir))
+                manifest["animations"][scene_id] = entry
+                yield scene, anim
+        
+        print(f"📖 Streaming storyboard: {storyboard_path}")
+        if timeline_path:
+            with _open_atomic(timeline_path) as f:
+                self._write_timeline_json(f, exported(), spill=spill)
+        else:
+            for _ in exported():
+                pass
+        
+        _write_atomic(os.path.join(output_dir, "manifest.json"), json.dumps(manifest, indent=2).encode())
+        
+        print(f"✅ Streamed {len(manifest['animations'])} animations to {output_dir}")
+        self._print_cache_stats()
+        return manifest
+    
+    def _is_contiguous(self, storyboard_path) -> bool:
+        """
+        Whether each character's rows are contiguous across the storyboard(s).
+        Only files can be checked; stdin and streams cannot be read twice.
+        """
+        sources = storyboard_path if isinstance(storyboard_path, (list, tuple)) else [storyboard_path]
+        if not all(isinstance(source, str) and source != "-" for source in sources):
+            return False
+        return _contiguous(scene["character"] for scene in self.parser.iter_all_rows(sources))
+    
+    def _print_cache_stats(self):
+        cache = self.parser.cache
+        if cache is not None:
+            print(f"   Extraction cache: {cache.hits} hits, {cache.misses} misses "
+                  f"({cache.hit_rate:.0%} hit rate, {len(cache)} entries)")
+        
+        info = self.engine.cache_info()
+        print(f"   Template cache: {info.hits} hits, {info.misses} misses")
+    
+    def simplify_all(self, tolerances: dict = None) -> dict:
+        """
+        Remove redundant keyframes from every animation before export.
+        
+        Returns {scene_id: (bytes before, bytes after)} measured on the
+        Three.js JSON as export_all writes it.
+        """
+        report = {}
         for scene_id, anim in self.animations.items():
-            if format == "lottie":
-                data = self.engine.export_to_lottie(anim)
-            else:
-                data = self.engine.export_to_threejs(anim)
-            
-            filename = f"{scene_id}.json"
-            filepath = os.path.join(output_dir, filename)
-            
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2)
-            
-            manifest["animations"][scene_id] = {
-                "file": filename,
-                "duration": anim.duration,
-                "loop": anim.loop
-            }
+            simplified = self.engine.simplify(anim, tolerances)
+            before = len(json.dumps(self.engine.export_to_threejs(anim), indent=2))
+            after = len(json.dumps(self.engine.export_to_threejs(simplified), indent=2))
+            self.animations[scene_id] = simplified
+            report[scene_id] = (before, after)
+            if after < before:
+                print(f"   ✂ {scene_id}: {before:,} -> {after:,} bytes (-{before - after:,})")
+        
+        total_before = sum(before for before, _ in report.values())
+        total_after = sum(after for _, after in report.values())
+        print(f"✅ Simplified {len(report)} animations: {total_before:,} -> {total_after:,} bytes")
+        return report
+    
+    def export_all(self, output_dir: str, format: str = "lottie", jobs: int = 1):
+        """
+        Export all animations to files, atomically and in scene order; jobs > 1
+        uses a process pool of at most one worker per MIN_CLIPS_PER_JOB clips.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        
+        manifest = {
+            "version": "1.0",
+            "format": format,
+            "animations": {}
+        }
+        
+        tasks = [(scene_id, anim, format, output_dir) for scene_id, anim in self.animations.items()]
+        jobs = min(jobs, len(tasks) // MIN_CLIPS_PER_JOB)
+        if jobs > 1:
+            chunksize = max(1, len(tasks) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = list(pool.map(_export_clip, tasks, chunksize=chunksize))
+        else:
+            results = [_export_clip(task) for task in tasks]
+        
+        for scene_id, entry in results:
+            manifest["animations"][scene_id] = entry
         
         # Save manifest
         manifest_path = os.path.join(output_dir, "manifest.json")
-        with open(manifest_path, 'w') as f:
-            json.dump(manifest, f, indent=2)
+        _write_atomic(manifest_path, json.dumps(manifest, indent=2).encode())
         
         print(f"✅ Exported {len(self.animations)} animations to {output_dir}")
         return manifest
     
-    def export_combined_timeline(self, output_path: str):
-        """Export a single timeline JSON for web player."""
+    def build_incremental(
+        self,
+        storyboard_path,
+        output_dir: str,
+        state_path: str,
+        format: str = "threejs",
+        simplify: bool = False,
+        **extract_options
+    ) -> dict:
+        """
+        Rebuild only what changed since the last build (per-scene fingerprints
+        of extraction inputs, actions and clip bytes are kept in state_path).
+        Returns counts per outcome and whether the manifest and timeline changed.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        state = self._load_build_state(state_path, format)
+        previous_scenes = state["scenes"]
+        report = dict.fromkeys(["extracted", "generated", "written", "unchanged", "removed"], 0)
+        
+        scenes = list(self.parser.iter_all_rows(storyboard_path))
+        row_fps = {}
+        pending = []
+        retry_fallbacks = self.parser.model_available
+        for scene in scenes:
+            row_fps[scene["id"]] = _fingerprint(
+                scene["dialogue"],
+                f"{scene['character']}: {scene['step_name']}",
+                self.parser.backend,
+                PROMPT_VERSION,
+            )
+            previous = previous_scenes.get(scene["id"], {})
+            fallback = previous.get("source") == "fallback"
+            if previous.get("row") == row_fps[scene["id"]] and not (fallback and retry_fallbacks):
+                scene["actions"] = (FallbackActions if fallback else ActionDescriptor)(previous["actions"])
+            else:
+                pending.append(scene)
+        self.parser.attach_actions(pending, **extract_options)
+        report["extracted"] = len(pending)
+        
+        manifest = {
+            "version": "1.0",
+            "format": format,
+            "animations": {}
+        }
         timeline = {
             "characters": {},
             "total_duration": 0
         }
+        new_scenes = {}
         
-        current_time = 0
-        for scene in self.scenes:
-            char = scene["character"]
-            if char not in timeline["characters"]:
-                timeline["characters"][char] = {"scenes": [], "total_duration": 0}
+        for scene in scenes:
+            scene_id = scene["id"]
+            previous = previous_scenes.get(scene_id, {})
+            clip_fp = _fingerprint(scene["actions"].to_dict(), scene["duration"], simplify, format)
             
-            anim_data = self.engine.export_to_threejs(self.animations[scene["id"]])
+            anim = None
+            data = None
+            if previous.get("clip_fp") == clip_fp:
+                data = _read_bytes(os.path.join(output_dir, previous["entry"]["file"]))
+            if data is not None and hashlib.sha256(data).hexdigest() == previous["clip"]:
+                entry = previous["entry"]
+                report["unchanged"] += 1
+            else:
+                anim = self._generate(scene, simplify)
+                filename, data, extra = _export_clip_data(self.engine, scene_id, anim, format)
+                entry = {"file": filename, "duration": anim.duration, "loop": anim.loop, **extra}
+                report["generated"] += 1
+                if _write_if_changed(os.path.join(output_dir, filename), data):
+                    report["written"] += 1
             
-            timeline["characters"][char]["scenes"].append({
-                "id": scene["id"],
+            manifest["animations"][scene_id] = entry
+            new_scenes[scene_id] = {
+                "row": row_fps[scene_id],
+                "actions": scene["actions"].to_dict(),
+                "source": "fallback" if isinstance(scene["actions"], FallbackActions) else "model",
+                "clip_fp": clip_fp,
+                "clip": hashlib.sha256(data).hexdigest(),
+                "entry": entry,
+            }
+            
+            # The timeline embeds the Three.js clip, which is the clip file itself for threejs builds
+            if format == "threejs":
+                animation = json.loads(data)
+            else:
+                animation = self.engine.export_to_threejs(anim or self._generate(scene, simplify))
+            char = timeline["characters"].setdefault(scene["character"], {"scenes": [], "total_duration": 0})
+            char["scenes"].append({
+                "id": scene_id,
                 "step": scene["step_name"],
                 "dialogue": scene["dialogue"],
-                "start_time": timeline["characters"][char]["total_duration"],
+                "start_time": char["total_duration"],
                 "duration": scene["duration"],
-                "animation": anim_data,
-                "actions": scene["actions"]
+                "animation": animation,
+                "actions": scene["actions"].to_dict()
             })
+            char["total_duration"] += scene["duration"]
+        
+        live_files = {entry["file"] for entry in manifest["animations"].values()}
+        for scene_id, previous in previous_scenes.items():
+            stale = previous["entry"]["file"]
+            if scene_id not in new_scenes and stale not in live_files:
+                try:
+                    os.remove(os.path.join(output_dir, stale))
+                    report["removed"] += 1
+                except FileNotFoundError:
+                    pass
+        
+        report["manifest"] = _write_if_changed(
+            os.path.join(output_dir, "manifest.json"), json.dumps(manifest, indent=2).encode()
+        )
+        report["timeline"] = _write_if_changed(
+            os.path.join(output_dir, "timeline.json"), json.dumps(timeline, indent=2).encode()
+        )
+        
+        os.makedirs(os.path.dirname(os.path.abspath(state_path)), exist_ok=True)
+        _write_atomic(state_path, json.dumps({
+            "version": BUILD_STATE_VERSION,
+            "format": format,
+            "scenes": new_scenes
+        }).encode())
+        
+        print(f"✅ Incremental build: {report['extracted']} extracted, {report['generated']} generated, "
+              f"{report['written']} written, {report['unchanged']} unchanged, {report['removed']} removed")
+        return report
+    
+    def _generate(self, scene: dict, simplify: bool = False):
+        anim = self.engine.generate_animation(scene["actions"], scene["duration"])
+        anim.name = scene["id"]
+        return self.engine.simplify(anim) if simplify else anim
+    
+    def _load_build_state(self, state_path: str, format: str) -> dict:
+        """Previous build state, or an empty one if missing, unreadable or from another format."""
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {"scenes": {}}
+        if state.get("version") != BUILD_STATE_VERSION or state.get("format") != format:
+            return {"scenes": {}}
+        return state
+    
+    def export_combined_timeline(self, output_path: str, stream: bool = False):
+        """
+        Export a single timeline JSON for web player.
+        
+        With stream=True scenes are exported and written one at a time, so
+        peak memory is one scene's clip instead of the whole timeline. The
+        file is byte-identical; a summary (scene counts and durations per
+        character) is returned instead of the full timeline.
+        """
+        if stream:
+            spill = not _contiguous(scene["character"] for scene in self.scenes)
+            with _open_atomic(output_path) as f:
+                summary = self._write_timeline_json(f, spill=spill)
+            print(f"✅ Streamed combined timeline to {output_path}")
+            return summary
+        
+        timeline = {
+            "characters": {},
+            "total_duration": 0
+        }
+        
+        for char, scene in self._iter_timeline_scenes():
+            if char not in timeline["characters"]:
+                timeline["characters"][char] = {"scenes": [], "total_duration": 0}
             
+            timeline["characters"][char]["scenes"].append(scene)
             timeline["characters"][char]["total_duration"] += scene["duration"]
         
         with open(output_path, 'w') as f:
@@ -96,22 +504,173 @@ class AnimationGenerator:
         
         print(f"✅ Exported combined timeline to {output_path}")
         return timeline
+    
+    def export_timeline_ndjson(self, output_path: str):
+        """
+        Export the timeline as NDJSON for progressive loading by the web player.
+        
+        Each line is a scene record ({"type": "scene", "character": ..., plus
+        the same fields as the timeline JSON}) in storyboard order, followed
+        by one {"type": "character", ...} summary line per character.
+        """
+        summary = {}
+        with open(output_path, 'w') as f:
+            for char, scene in self._iter_timeline_scenes():
+                f.write(json.dumps({"type": "scene", "character": char, **scene}) + "\n")
+                totals = summary.setdefault(char, {"scenes": 0, "total_duration": 0})
+                totals["scenes"] += 1
+                totals["total_duration"] += scene["duration"]
+            
+            for char, totals in summary.items():
+                f.write(json.dumps({"type": "character", "character": char, **totals}) + "\n")
+        
+        print(f"✅ Exported NDJSON timeline to {output_path}")
+        return {"characters": summary, "total_duration": 0}
+    
+    def _iter_timeline_scenes(self, pairs=None):
+        """
+        Yield (character, timeline scene) in storyboard order, exporting one
+        clip at a time. pairs is an iterable of (scene, animation) and
+        defaults to self.scenes with their generated animations.
+        """
+        if pairs is None:
+            pairs = ((scene, self.animations[scene["id"]]) for scene in self.scenes)
+        
+        totals = {}
+        for scene, anim in pairs:
+            char = scene["character"]
+            start_time = totals.get(char, 0)
+            
+            yield char, {
+                "id": scene["id"],
+                "step": scene["step_name"],
+                "dialogue": scene["dialogue"],
+                "start_time": start_time,
+                "duration": scene["duration"],
+                "animation": self.engine.export_to_threejs(anim),
+                "actions": scene["actions"].to_dict()
+            }
+            
+            totals[char] = start_time + scene["duration"]
+    
+    def _write_timeline_json(self, f, pairs=None, spill: bool = False) -> dict:
+        """
+        Write the timeline incrementally, reproducing json.dump(timeline, f, indent=2).
+        
+        Scenes of a character must be contiguous (as parse_full_storyboard
+        produces them), since a character's block is closed when the next
+        one starts. With spill=True each character's scenes are written to
+        a temp file instead and the blocks are joined at the end, so any
+        order works.
+        """
+        summary = {}
+        spills = {}
+        current = None
+        
+        def open_character(char):
+            f.write(("," if current is not None else "") + "\n    " + json.dumps(char) + ': {\n      "scenes": [')
+        
+        def close_character(char):
+            f.write(
+                "\n      ],\n      \"total_duration\": "
+                + json.dumps(summary[char]["total_duration"])
+                + "\n    }"
+            )
+        
+        try:
+            f.write('{\n  "characters": {')
+            for char, scene in self._iter_timeline_scenes(pairs):
+                if char not in summary:
+                    summary[char] = {"scenes": 0, "total_duration": 0}
+                    if spill:
+                        spills[char] = tempfile.TemporaryFile("w+", encoding="utf-8")
+                if not spill and char != current:
+                    if summary[char]["scenes"]:
+                        raise ValueError(f"Scenes for '{char}' are not contiguous; use spill=True")
+                    if current is not None:
+                        close_character(current)
+                    open_character(char)
+                    current = char
+                
+                totals = summary[char]
+                out = spills[char] if spill else f
+                out.write(("," if totals["scenes"] else "") + "\n        ")
+                out.write(json.dumps(scene, indent=2).replace("\n", "\n        "))
+                totals["scenes"] += 1
+                totals["total_duration"] += scene["duration"]
+            
+            if spill:
+                for char, block in spills.items():
+                    open_character(char)
+                    block.seek(0)
+                    shutil.copyfileobj(block, f)
+                    close_character(char)
+                    current = char
+            elif current is not None:
+                close_character(current)
+            if summary:
+                f.write("\n  ")
+            f.write('},\n  "total_duration": 0\n}')
+        finally:
+            for block in spills.values():
+                block.close()
+        
+        return {"characters": summary, "total_duration": 0}
 
 
 if __name__ == "__main__":
     import sys
+    import argparse
+    
+    arg_parser = argparse.ArgumentParser(description="Generate avatar animations from the storyboard")
+    arg_parser.add_argument("storyboards", nargs="*", help="Storyboard files, or - for stdin (default: docs/storyboard_script.md)")
+    arg_parser.add_argument("--stream", action="store_true", help="Export scene by scene with bounded memory")
+    arg_parser.add_argument("--incremental", action="store_true", help="Rebuild and rewrite only what changed since the last run")
+    arg_parser.add_argument("--state", default="./.cache/build_state.json", help="Incremental build state file")
+    arg_parser.add_argument("--translation", action="append", default=[], metavar="LANG=PATH",
+                            help="Translated storyboard sharing the primary's actions, exported to <output>/LANG (repeatable)")
+    arg_parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Export worker processes")
+    arg_parser.add_argument("--simplify", action="store_true", help="Remove redundant keyframes before export")
+    arg_parser.add_argument("--backend", choices=available_backends(), help="Action extractor backend (default: ACTION_EXTRACTOR, else gemini with an API key, else keyword)")
+    arg_parser.add_argument("--concurrency", type=int, default=8, help="Concurrent model calls during extraction")
+    arg_parser.add_argument("--rate", type=float, help="Maximum model calls per second")
+    arg_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Dialogues per model call (1 disables batching)")
+    arg_parser.add_argument("--cache", default="./.cache/extractions.sqlite3", help="Action extraction cache file")
+    arg_parser.add_argument("--no-cache", action="store_true", help="Always call the model")
+    arg_parser.add_argument("--cache-only", action="store_true", help="Never call the model; keyword fallback on cache misses")
+    arg_parser.add_argument("--cache-ttl", type=float, help="Expire cached extractions after this many seconds")
+    arg_parser.add_argument("--cache-max-entries", type=int, help="Evict least recently used extractions beyond this count")
+    args = arg_parser.parse_args()
+    if args.stream and args.incremental:
+        arg_parser.error("--stream and --incremental cannot be combined")
+    if args.translation and (args.stream or args.incremental):
+        arg_parser.error("--translation cannot be combined with --stream or --incremental")
+    translations = dict(item.split("=", 1) for item in args.translation if "=" in item)
+    if len(translations) != len(args.translation):
+        arg_parser.error("--translation expects LANG=PATH")
     
     # Get API key from environment
     api_key = os.getenv("GEMINI_API_KEY")
     
-    generator = AnimationGenerator(api_key)
+    cache = None
+    if not args.no_cache:
+        cache = ExtractionCache(
+            args.cache,
+            ttl=args.cache_ttl,
+            max_entries=args.cache_max_entries,
+            cache_only=args.cache_only,
+        )
+    
+    generator = AnimationGenerator(api_key, cache=cache, backend=args.backend)
     
     # Paths
     script_path = "../../docs/storyboard_script.md"
     output_dir = "./assets/output/animations"
     
     # Check if storyboard exists
-    if not os.path.exists(script_path):
+    if args.storyboards:
+        script_path = args.storyboards
+    elif not os.path.exists(script_path):
         # Try alternate paths
         alt_paths = [
             "../docs/storyboard_script.md",
@@ -126,7 +685,40 @@ if __name__ == "__main__":
             print("❌ Could not find storyboard_script.md")
             sys.exit(1)
     
+    extract_options = {"concurrency": args.concurrency, "rate": args.rate, "batch_size": args.batch_size}
+    
     # Run pipeline
-    generator.process_storyboard(script_path)
-    generator.export_all(output_dir, format="threejs")
-    generator.export_combined_timeline(os.path.join(output_dir, "timeline.json"))
+    if args.incremental:
+        generator.build_incremental(
+            script_path,
+            output_dir,
+            args.state,
+            format="threejs",
+            simplify=args.simplify,
+            **extract_options
+        )
+        sys.exit(0)
+    
+    if args.stream:
+        generator.stream_storyboard(
+            script_path,
+            output_dir,
+            format="threejs",
+            timeline_path=os.path.join(output_dir, "timeline.json"),
+            simplify=args.simplify,
+            **extract_options
+        )
+        sys.exit(0)
+    
+    if translations:
+        generators = generator.process_translations({"en": script_path, **translations}, **extract_options)
+    else:
+        generator.process_storyboard(script_path, **extract_options)
+        generators = {"en": generator}
+    
+    for language, language_generator in generators.items():
+        language_dir = output_dir if language_generator is generator else os.path.join(output_dir, language)
+        if args.simplify:
+            language_generator.simplify_all()
+        language_generator.export_all(language_dir, format="threejs", jobs=args.jobs)
+        language_generator.export_combined_timeline(os.path.join(language_dir, "timeline.json"))
@@ -0,0 +1,233 @@
+"""
+Offline action classifier (the "local" extractor backend).
+
+Dialogues are turned into hashed n-gram features (word unigrams and
+bigrams plus character 3-5 grams, so inflections and Marathi text share
+features) and classified by nearest centroid. The classifier is trained
+at startup from KEYWORD_RULES and from the storyboards' animation hint
+column: each hint is labelled with HINT_RULES, and the row's dialogue
+(English, and Marathi aligned by step) becomes an example of that label.
+
+primary_action, motion_type and sub_actions are separate heads whose
+centroids are stacked into one matrix, so a batch of dialogues is scored
+with a single matrix multiply.
+"""
+
+import re
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from gemini_action_parser import (
+    KEYWORD_RULES,
+    GeminiActionParser,
+    KeywordMatcher,
+    _fallback_result,
+)
+
+DOCS_DIR = Path(__file__).resolve().parents[2] / "docs"
+# {language: storyboard}; rows of other languages are labelled by the primary's hints
+TRAINING_STORYBOARDS = {
+    "en": DOCS_DIR / "storyboard_script.md",
+    "mr": DOCS_DIR / "storyboard_marathi.md",
+}
+
+# Animation hint keywords in priority order -> labelled actions
+HINT_RULES = [
+    (("tongue",), {"primary_action": "tongueOut", "sub_actions": ["brush_tongue"]}),
+    (("spitting",), {"primary_action": "spitting"}),
+    (("rinsing",), {"primary_action": "rinsing", "sub_actions": ["drink", "swish", "spit"]}),
+    (("mouth opens",), {"primary_action": "openMouth"}),
+    (("hands out",), {"primary_action": "pickup"}),
+    (("paste", "points to brush", "points"), {"primary_action": "applying_paste"}),
+    (("45",), {"primary_action": "brushing", "motion_type": "angled_45"}),
+    (("circular on front",), {"primary_action": "brushing", "motion_type": "circular", "sub_actions": ["brush_front_teeth"]}),
+    (("circular",), {"primary_action": "brushing", "motion_type": "circular"}),
+    (("lower",), {"primary_action": "brushing", "sub_actions": ["brush_bottom_teeth"]}),
+    (("upper", "up"), {"primary_action": "brushing", "sub_actions": ["brush_top_teeth"]}),
+    (("brushing", "strokes", "back-forth"), {"primary_action": "brushing"}),
+    (("jumps",), {"primary_action": "celebrate"}),
+    (("thumbs up",), {"primary_action": "thumbsUp"}),
+    (("wave",), {"primary_action": "wave"}),
+    (("salute", "nods"), {"primary_action": "greeting"}),
+]
+
+HEADS = ("primary_action", "motion_type", "sub_actions")
+
+# Rows featurized and scored per matrix multiply; bounds the dense feature block
+BATCH_ROWS = 1024
+MAX_CACHED_WORDS = 100_000
+
+_WORD = re.compile(r"\w+")
+
+
+class LocalActionClassifier:
+    """
+    Nearest-centroid classifier over hashed n-gram features.
+
+    Similarities are cosines in [0, 1]; each head's confidence is the
+    softmax (at `temperature`) of its class similarities. Dialogues whose
+    best primary_action similarity is below `min_similarity` share no
+    vocabulary with the training data and are classified as idle with
+    zero confidence.
+    """
+
+    def __init__(self, dim: int = 2 ** 13, temperature: float = 0.05, min_similarity: float = 0.1):
+        self.dim = dim
+        self.temperature = temperature
+        self.min_similarity = min_similarity
+        self.classes = {}  # head -> list of labels (sub_actions labels are tuples)
+        self.slices = {}  # head -> slice of the stacked centroid matrix
+        self.centroids = np.zeros((0, dim), dtype=np.float32)
+        self._word_cache = {}
+
+    def _hash(self, gram: str) -> int:
+        # crc32 rather than hash(): features must not change between processes
+        return zlib.crc32(gram.encode("utf-8")) % self.dim
+
+    def _word_columns(self, word: str) -> list[int]:
+        """Columns of a word and its character 3-5 grams, cached per word."""
+        columns = self._word_cache.get(word)
+        if columns is None:
+            if len(self._word_cache) >= MAX_CACHED_WORDS:
+                self._word_cache.clear()
+            padded = f" {word} "
+            grams = [word] + [padded[i:i + n] for n in (3, 4, 5) for i in range(len(padded) - n + 1)]
+            columns = self._word_cache[word] = [self._hash(gram) for gram in grams]
+        return columns
+
+    def _columns(self, text: str) -> list[int]:
+        words = _WORD.findall(text.lower())
+        columns = [self._hash(f"{a} {b}") for a, b in zip(words, words[1:])]
+        for word in words:
+            columns.extend(self._word_columns(word))
+        return columns
+
+    def featurize(self, texts: list[str]) -> np.ndarray:
+        """L2-normalized log-count feature rows, one per text."""
+        lengths, columns = [], []
+        for text in texts:
+            text_columns = self._columns(text)
+            columns.extend(text_columns)
+            lengths.append(len(text_columns))
+
+        # Work on the non-zero cells only, then scatter them into the dense block
+        rows = np.repeat(np.arange(len(texts)), lengths)
+        cells, counts = np.unique(rows * self.dim + np.asarray(columns, dtype=np.intp), return_counts=True)
+        rows, columns = np.divmod(cells, self.dim)
+        weights = np.log1p(counts).astype(np.float32)
+        norms = np.sqrt(np.bincount(rows, weights * weights, minlength=len(texts)))
+        weights /= np.maximum(norms[rows], 1e-12)
+
+        features = np.zeros((len(texts), self.dim), dtype=np.float32)
+        features[rows, columns] = weights
+        return features
+
+    def fit(self, texts: list[str], labels: list[dict]) -> "LocalActionClassifier":
+        """Train on texts with action dicts (primary_action, motion_type, sub_actions)."""
+        features = self.featurize(texts)
+        blocks = []
+        start = 0
+        for head in HEADS:
+            values = [_head_value(label, head) for label in labels]
+            classes = sorted(set(values), key=repr)
+            index = {value: i for i, value in enumerate(classes)}
+            members = np.zeros((len(classes), len(texts)), dtype=np.float32)
+            members[[index[value] for value in values], np.arange(len(texts))] = 1.0
+            centroids = members @ features
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+            blocks.append(centroids)
+            self.classes[head] = classes
+            self.slices[head] = slice(start, start + len(classes))
+            start += len(classes)
+        self.centroids = np.vstack(blocks)
+        return self
+
+    def predict(self, texts: list[str]) -> list[dict]:
+        """
+        {"primary_action", "motion_type", "sub_actions", "confidence": {head: p}}
+        per text, scored with one matrix multiply per BATCH_ROWS texts.
+        """
+        if not texts:
+            return []
+        similarities = np.vstack([
+            self.featurize(texts[start:start + BATCH_ROWS]) @ self.centroids.T
+            for start in range(0, len(texts), BATCH_ROWS)
+        ])
+        picks = {}
+        for head in HEADS:
+            scores = similarities[:, self.slices[head]]
+            logits = (scores - scores.max(axis=1, keepdims=True)) / self.temperature
+            probabilities = np.exp(logits)
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+            best = scores.argmax(axis=1)
+            picks[head] = (best, probabilities[np.arange(len(texts)), best], scores.max(axis=1))
+
+        results = []
+        for i in range(len(texts)):
+            if picks["primary_action"][2][i] < self.min_similarity:
+                results.append({
+                    "primary_action": "idle",
+                    "motion_type": "static",
+                    "sub_actions": [],
+                    "confidence": dict.fromkeys(HEADS, 0.0),
+                })
+                continue
+            result = {}
+            for head in HEADS:
+                value = self.classes[head][picks[head][0][i]]
+                result[head] = list(value) if head == "sub_actions" else value
+            result["confidence"] = {head: round(float(picks[head][1][i]), 4) for head in HEADS}
+            results.append(result)
+        return results
+
+    def extract_batch(self, dialogues: list[str]) -> list[dict]:
+        """Extractor backend interface: full action dicts with confidences."""
+        results = []
+        for prediction in self.predict(dialogues):
+            result = _fallback_result(None)
+            result.update(prediction)
+            results.append(result)
+        return results
+
+
+def _head_value(label: dict, head: str):
+    if head == "sub_actions":
+        return tuple(label.get("sub_actions", []))
+    return label.get(head, "static" if head == "motion_type" else "idle")
+
+
+def training_examples(storyboards: dict = None, primary: str = "en") -> tuple:
+    """(texts, labels) from KEYWORD_RULES and the storyboards' animation hints."""
+    texts, labels = [], []
+    for forms, actions in KEYWORD_RULES:
+        for form in forms:
+            texts.append(form)
+            labels.append(actions)
+
+    storyboards = TRAINING_STORYBOARDS if storyboards is None else storyboards
+    available = {lang: path for lang, path in storyboards.items() if Path(path).exists()}
+    if primary not in available:
+        return texts, labels
+
+    hint_matcher = KeywordMatcher(HINT_RULES)
+    parser = GeminiActionParser(backend="keyword")  # Only its row reader is used
+    rows = {lang: list(parser.iter_all_rows(str(path))) for lang, path in available.items()}
+    hint_labels = {row["id"]: hint_matcher.match(row["animation_hint"]) for row in rows[primary]}
+    for lang, scenes in rows.items():
+        for row in scenes:
+            label = hint_labels.get(row["id"])
+            if label is None or not row["dialogue"]:
+                continue
+            texts.append(row["dialogue"])
+            labels.append(label)
+            if lang == primary:
+                texts.append(row["animation_hint"])
+                labels.append(label)
+    return texts, labels
+
+
+def train_local_classifier(storyboards: dict = None, **options) -> LocalActionClassifier:
+    texts, labels = training_examples(storyboards)
+    return LocalActionClassifier(**options).fit(texts, labels)
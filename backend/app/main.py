@@ -1,7 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.services.animation_service import animation_library
+from app.services.audio_cache import audio_cache
+from app.services.http_client import http_client
+from app.services.prerecorded_audio import prerecorded_audio
+from app.services.tts_service import ELEVENLABS_MODEL_ID
 
-app = FastAPI(title="ToothBuddy API", description="Backend for ToothBuddy App", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Bake generated clips once so pose requests never interpolate
+    animation_library.load()
+    # Index synthesized audio kept from earlier runs
+    audio_cache.load()
+    # Lines already generated by scripts/generate_audio_files.py skip synthesis
+    prerecorded_audio.load(ELEVENLABS_MODEL_ID)
+    # One pooled outbound client for ElevenLabs and any other upstream
+    app.state.http_client = http_client.start()
+    yield
+    await http_client.aclose()
+
+app = FastAPI(title="ToothBuddy API", description="Backend for ToothBuddy App", version="0.1.0", lifespan=lifespan)
 
 # CORS configuration
 origins = [
@@ -32,6 +51,8 @@ app.include_router(children.router)
 app.include_router(sessions.router)
 from app.routers import tts
 app.include_router(tts.router)
+from app.routers import animations
+app.include_router(animations.router)
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,58 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter: `rate` requests per second on
+    average, with bursts of up to `capacity` (defaults to one second's
+    worth). acquire() waits until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        # The lock makes waiters queue up in order instead of racing for refills
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+
+async def retry_async(
+    call: Callable[[], Awaitable],
+    retries: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0,
+):
+    """
+    Await call(), retrying up to `retries` times on any exception with
+    full-jitter exponential backoff (a random delay in
+    [0, min(max_delay, base_delay * 2**attempt)]). The last exception is
+    re-raised.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return await call()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            if attempt == retries:
+                raise
+            await asyncio.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
@@ -0,0 +1,100 @@
+import json
+import math
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from app.services.animation_service import MAX_RANGE_FRAMES, animation_library
+
+router = APIRouter(
+    prefix="/api/animations",
+    tags=["animations"]
+)
+
+MAX_POSE_FRAMES = MAX_RANGE_FRAMES
+CACHE_CONTROL = "no-cache"  # Always revalidate; unchanged clips cost a 304
+
+
+def _get_clip(scene_id: str):
+    clip = animation_library.get(scene_id)
+    if clip is None:
+        raise HTTPException(status_code=404, detail=f"Unknown scene: {scene_id}")
+    return clip
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match", "")
+    return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+
+@router.get("/")
+def list_animations():
+    """List the cached clips with their duration and ETag."""
+    return {
+        scene_id: {
+            "duration": clip.baked.duration,
+            "loop": clip.loop,
+            "etag": clip.etag,
+            "channels": clip.baked.channels,
+        }
+        for scene_id, clip in animation_library.clips.items()
+    }
+
+
+@router.get("/{scene_id}")
+def get_animation(scene_id: str, request: Request):
+    """Return the exported clip file for a scene."""
+    clip = _get_clip(scene_id)
+    headers = {"ETag": clip.etag, "Cache-Control": CACHE_CONTROL}
+    if _not_modified(request, clip.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=clip.content, media_type=clip.media_type, headers=headers)
+
+
+@router.get("/{scene_id}/pose")
+def get_pose(
+    scene_id: str,
+    request: Request,
+    t: Optional[float] = Query(None, description="Time in seconds"),
+    start: Optional[float] = Query(None, description="Range start in seconds"),
+    end: Optional[float] = Query(None, description="Range end in seconds"),
+    fps: Optional[int] = Query(None, gt=0, description="Range sample rate (defaults to the bake rate)"),
+):
+    """
+    Sample pre-baked pose vectors for a scene.
+
+    - **t**: single pose at this time
+    - **start**/**end**/**fps**: pose stream over a time range
+    """
+    clip = _get_clip(scene_id)
+    baked = clip.baked
+    # nan and inf parse as floats but are no time, and nan slips past comparisons
+    if any(value is not None and not math.isfinite(value) for value in (t, start, end)):
+        raise HTTPException(status_code=400, detail="t, start and end must be finite numbers")
+
+    if t is not None:
+        body = {"scene_id": scene_id, "time": t, "pose": animation_library.sample(clip, t)}
+        variant = f"t={t}"
+    elif start is not None and end is not None:
+        fps = fps or animation_library.fps
+        if end < start:
+            raise HTTPException(status_code=400, detail="end must not be before start")
+        if (end - start) * fps + 1 > MAX_POSE_FRAMES:
+            raise HTTPException(status_code=400, detail=f"Range exceeds {MAX_POSE_FRAMES} frames")
+        times, poses = animation_library.sample_range(clip, start, end, fps)
+        body = {"scene_id": scene_id, "fps": fps, "times": times, "poses": poses}
+        variant = f"{start}-{end}@{fps}"
+    else:
+        raise HTTPException(status_code=400, detail="Pass either t or start and end")
+
+    # Poses are a pure function of the clip and the query
+    etag = f'{clip.etag[:-1]}-{variant}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    body["channels"] = baked.channels
+    body["labels"] = baked.labels
+    return Response(
+        content=json.dumps(body),
+        media_type="application/json",
+        headers=headers,
+    )
@@ -1,34 +1,174 @@
-from fastapi import APIRouter, HTTPException, Response
+import os
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
-from app.services.tts_service import generate_audio
+from app.services.audio_cache import CachedAudio, audio_cache
+from app.services.prerecorded_audio import prerecorded_audio
+from app.services.tts_service import (
+    cached_audio,
+    get_audio,
+    prerecorded_path,
+    stream_audio,
+    synthesis_flights,
+    tts_cache_key,
+)
 
 router = APIRouter(
     prefix="/api/tts",
     tags=["tts"]
 )
 
+# Audio is content-addressed: a key always names the same request
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 class TTSRequest(BaseModel):
     text: str
     lang: str = "mr"  # 'mr' or 'en'
     character: str = "luna"  # 'luna', 'captain', or 'dr_bright'
+    stream: bool = False  # Forward audio chunks as ElevenLabs produces them
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    # If-None-Match only yields 304 for GET and HEAD; other methods ignore it here
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if_none_match = request.headers.get("if-none-match", "")
+    return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+
+def _byte_range(header: str, size: int) -> Optional[tuple]:
+    """
+    (start, end) inclusive for a single "bytes=" range, None to ignore the
+    header (multiple ranges, another unit or an invalid spec such as
+    "bytes=5-3"), or raise 416 if it is valid but unsatisfiable.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = (part.strip() for part in spec.partition("-"))
+    if not (first or last) or not all(part.isascii() and part.isdigit() for part in (first, last) if part):
+        return None
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    if start >= size or end < start:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+def _audio_response(request: Request, audio: CachedAudio) -> Response:
+    """Audio with validators, honouring If-None-Match (GET only) and single Range requests."""
+    headers = {
+        "ETag": audio.etag,
+        "Cache-Control": CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+        "Content-Location": f"{router.prefix}/audio/{audio.key}",
+    }
+    if _not_modified(request, audio.etag):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == audio.etag):
+        byte_range = _byte_range(range_header, len(audio.content))
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(audio.content)}"
+            return Response(
+                content=audio.content[start:end + 1],
+                status_code=206,
+                media_type="audio/mpeg",
+                headers=headers,
+            )
+    return Response(content=audio.content, media_type="audio/mpeg", headers=headers)
+
 
 @router.post("/generate")
-async def generate_tts(request: TTSRequest):
+async def generate_tts(request: TTSRequest, http_request: Request):
     """
     Generate TTS audio using ElevenLabs API.
-    
+
+    Text that was pre-recorded by scripts/generate_audio_files.py (same
+    language and voice) is served from its file; other repeat requests
+    are served from the audio cache. Synthesized and cached responses
+    carry a Content-Location: a GET URL for the same clip.
+
     - **text**: Text to speak
     - **lang**: Language code ('en' or 'mr')
     - **character**: Character name ('luna', 'captain', 'dr_bright')
+    - **stream**: on a cache miss, stream the audio while it is synthesized
+      (no ETag or Range; the clip is cached once the stream completes)
     """
+    path = prerecorded_path(request.text, request.lang, request.character)
+    if path is not None:
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            pass  # Removed since the index was loaded; synthesize instead
+        else:
+            # Zero-copy (sendfile) response; Starlette handles Range for files
+            return FileResponse(
+                path,
+                media_type="audio/mpeg",
+                headers={"Cache-Control": CACHE_CONTROL},
+                stat_result=stat_result,
+            )
+
     try:
-        audio_content = await generate_audio(
-            request.text, 
-            request.lang, 
-            request.character
-        )
-        return Response(content=audio_content, media_type="audio/mpeg")
+        if request.stream:
+            audio = cached_audio(request.text, request.lang, request.character)
+            if audio is None:
+                chunks = await stream_audio(request.text, request.lang, request.character)
+                key = tts_cache_key(request.text, request.lang, request.character)
+                return StreamingResponse(
+                    chunks,
+                    media_type="audio/mpeg",
+                    headers={"Cache-Control": "no-store", "Content-Location": f"{router.prefix}/audio/{key}"},
+                )
+        else:
+            audio = await get_audio(
+                request.text,
+                request.lang,
+                request.character
+            )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return _audio_response(http_request, audio)
+
+
+@router.get("/audio/{key}")
+def get_cached_audio(key: str, request: Request):
+    """Serve a cached clip by its cache key (supports Range and If-None-Match)."""
+    audio = audio_cache.get(key)
+    if audio is None:
+        raise HTTPException(status_code=404, detail="Audio not cached")
+    return _audio_response(request, audio)
+
+
+@router.get("/cache")
+def cache_stats():
+    """Audio cache size and hit counters."""
+    return audio_cache.stats()
+
+
+@router.get("/coalescing")
+def coalescing_stats():
+    """Synthesis calls started (leaders) and requests that shared one (coalesced)."""
+    return synthesis_flights.stats()
+
+
+@router.get("/prerecorded")
+def prerecorded_stats():
+    """Indexed pre-recorded lines and how many requests they served."""
+    return prerecorded_audio.stats()
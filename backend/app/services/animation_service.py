@@ -0,0 +1,124 @@
+import os
+import json
+import math
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.animation_engine import AnimationEngine, BakedAnimation, PackedClip
+
+logger = logging.getLogger(__name__)
+
+# Output directory of generate_animations.py (relative to backend/)
+ANIMATION_OUTPUT_DIR = os.getenv("ANIMATION_OUTPUT_DIR", "assets/output/animations")
+ANIMATION_BAKE_FPS = int(os.getenv("ANIMATION_BAKE_FPS", "30"))
+# Most frames sample_range returns in one call
+MAX_RANGE_FRAMES = 3600
+
+
+@dataclass
+class CachedClip:
+    scene_id: str
+    content: bytes  # Clip file as exported
+    media_type: str
+    etag: str
+    loop: bool
+    baked: BakedAnimation
+
+
+class AnimationLibrary:
+    """
+    In-process cache of exported clips, baked once at startup so pose
+    requests are an array lookup instead of keyframe interpolation.
+    """
+
+    def __init__(self, fps: int = ANIMATION_BAKE_FPS):
+        self.fps = fps
+        self.engine = AnimationEngine(cache_size=0)
+        self.clips: Dict[str, CachedClip] = {}
+
+    def load(self, output_dir: str = ANIMATION_OUTPUT_DIR) -> int:
+        """Load every clip listed in the output directory's manifest.json."""
+        manifest_path = os.path.join(output_dir, "manifest.json")
+        if not os.path.exists(manifest_path):
+            logger.warning(f"No animation manifest at {manifest_path}; animation API is empty")
+            return 0
+
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        clips = {}
+        for scene_id, entry in manifest.get("animations", {}).items():
+            try:
+                clips[scene_id] = self._load_clip(output_dir, scene_id, entry, manifest.get("format"))
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"Skipping animation {scene_id}: {e}")
+
+        self.clips = clips
+        logger.info(f"Loaded {len(clips)} animations from {output_dir} (baked at {self.fps} fps)")
+        return len(clips)
+
+    def _load_clip(self, output_dir: str, scene_id: str, entry: dict, format: str) -> CachedClip:
+        with open(os.path.join(output_dir, entry["file"]), 'rb') as f:
+            content = f.read()
+
+        if format == "packed":
+            packed = PackedClip(content)
+            animation = self.engine.import_packed(packed)
+            packed.close()
+            media_type = "application/octet-stream"
+        elif format == "threejs":
+            animation = self.engine.import_threejs(json.loads(content))
+            media_type = "application/json"
+        else:
+            raise ValueError(f"Unsupported animation format: {format}")
+        animation.loop = entry.get("loop", animation.loop)
+
+        return CachedClip(
+            scene_id=scene_id,
+            content=content,
+            media_type=media_type,
+            etag=f'"{hashlib.sha256(content).hexdigest()[:32]}"',
+            loop=animation.loop,
+            baked=self.engine.bake(animation, self.fps),
+        )
+
+    def get(self, scene_id: str) -> Optional[CachedClip]:
+        return self.clips.get(scene_id)
+
+    def _frame_index(self, clip: CachedClip, time: np.ndarray) -> np.ndarray:
+        baked = clip.baked
+        if clip.loop and baked.duration > 0:
+            time = np.mod(time, baked.duration)
+        frames = np.rint(time * baked.fps).astype(int)
+        return np.clip(frames, 0, len(baked.times) - 1)
+
+    def sample(self, clip: CachedClip, time: float) -> list:
+        """Pose vector (one value per channel) at `time` seconds."""
+        if not math.isfinite(time):
+            raise ValueError("time must be a finite number")
+        frame = self._frame_index(clip, np.asarray([time]))[0]
+        return clip.baked.values[:, frame].tolist()
+
+    def sample_range(self, clip: CachedClip, start: float, end: float, fps: int) -> tuple:
+        """
+        (times, poses) for frames in [start, end] at `fps`, poses as frames x
+        channels. Raises ValueError for non-finite bounds, a non-positive fps
+        or more than MAX_RANGE_FRAMES frames.
+        """
+        if not (math.isfinite(start) and math.isfinite(end)):
+            raise ValueError("start and end must be finite numbers")
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        count = int(max(end - start, 0.0) * fps) + 1
+        if count > MAX_RANGE_FRAMES:
+            raise ValueError(f"Range exceeds {MAX_RANGE_FRAMES} frames")
+        times = start + np.arange(count) / fps
+        frames = self._frame_index(clip, times)
+        return times.tolist(), clip.baked.values[:, frames].T.tolist()
+
+
+animation_library = AnimationLibrary()
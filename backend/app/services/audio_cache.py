@@ -0,0 +1,223 @@
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Relative to backend/, like the other service paths
+AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE_DIR", ".cache/tts")
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))  # 0 disables
+AUDIO_CACHE_HOT_BYTES = int(os.getenv("AUDIO_CACHE_HOT_BYTES", str(16 * 1024 * 1024)))
+AUDIO_SUFFIX = ".mp3"
+
+
+class CachedAudio(NamedTuple):
+    key: str
+    content: bytes
+    etag: str
+
+
+def normalize_text(text: str) -> str:
+    """NFC with runs of whitespace collapsed: spellings that sound identical share a key."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def audio_key(text: str, lang: str, character: str, voice_id: str, model_id: str, voice_settings: dict) -> str:
+    """Content address of a synthesis request: sha256 over everything that changes the audio."""
+    request = [normalize_text(text), lang, character, voice_id, model_id, voice_settings]
+    return hashlib.sha256(json.dumps(request, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def audio_etag(content: bytes) -> str:
+    return f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+class AudioCache:
+    """
+    Bounded cache of synthesized audio, keyed by audio_key.
+
+    Clips live on disk (one file per key) with least-recently-used
+    eviction once they exceed max_bytes; recency survives restarts
+    through the files' mtimes. The most recently used clips are also
+    kept in memory, up to hot_bytes, so repeat phrases skip the disk.
+
+    The index is guarded by a lock, so the cache can be used from worker
+    threads (sync routes, put() offloaded with asyncio.to_thread) and the
+    event loop at once; file reads and writes happen outside the lock.
+    """
+
+    def __init__(
+        self,
+        directory: str = AUDIO_CACHE_DIR,
+        max_bytes: int = AUDIO_CACHE_MAX_BYTES,
+        hot_bytes: int = AUDIO_CACHE_HOT_BYTES,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hot_bytes = hot_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size on disk, LRU first
+        self._hot: "OrderedDict[str, CachedAudio]" = OrderedDict()
+        self.disk_bytes = 0
+        self.hot_size = 0
+        self.hot_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + AUDIO_SUFFIX)
+
+    def load(self) -> int:
+        """Index the clips already on disk, oldest first, and trim to max_bytes."""
+        with self._lock:
+            self._entries.clear()
+            self._hot.clear()
+            self.disk_bytes = self.hot_size = 0
+        if not self.enabled:
+            return 0
+
+        found = []
+        if os.path.isdir(self.directory):
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if not name.endswith(AUDIO_SUFFIX):
+                        continue
+                    stat = os.stat(os.path.join(root, name))
+                    found.append((stat.st_mtime, name[:-len(AUDIO_SUFFIX)], stat.st_size))
+        with self._lock:
+            for _, key, size in sorted(found):
+                self._entries[key] = size
+                self.disk_bytes += size
+            self._evict()
+
+        logger.info(f"Audio cache: {len(self._entries)} clips ({self.disk_bytes / 1e6:.1f} MB) in {self.directory}")
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CachedAudio]:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            audio = self._hot.get(key)
+            if audio is not None:
+                self._hot.move_to_end(key)
+                self._entries.move_to_end(key)
+                self.hot_hits += 1
+                return audio
+            if key not in self._entries:
+                self.misses += 1
+                return None
+
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+            os.utime(path)  # Persist recency for the next load()
+        except OSError as e:
+            with self._lock:
+                self.misses += 1
+                if key not in self._entries:
+                    return None  # Evicted while we were reading it
+                self.disk_bytes -= self._entries.pop(key, 0)
+            logger.warning(f"Dropping unreadable cached audio {key}: {e}")
+            return None
+
+        audio = CachedAudio(key, content, audio_etag(content))
+        with self._lock:
+            self.disk_hits += 1
+            # It may have been evicted while the file was read
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._remember(audio)
+        return audio
+
+    def put(self, key: str, content: bytes) -> CachedAudio:
+        """
+        Store a clip (written atomically) and return it as a cache entry.
+        This writes a file; call it through asyncio.to_thread from async code.
+        """
+        audio = CachedAudio(key, content, audio_etag(content))
+        if not self.enabled or len(content) > self.max_bytes:
+            return audio
+
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Could not cache audio {key}: {e}")
+            return audio
+
+        with self._lock:
+            self.disk_bytes += len(content) - self._entries.pop(key, 0)
+            self._entries[key] = len(content)
+            self._remember(audio)
+            self._evict()
+        return audio
+
+    def _remember(self, audio: CachedAudio):
+        """Add to the in-memory tier, dropping its least recently used clips to fit (lock held)."""
+        size = len(audio.content)
+        if size > self.hot_bytes:
+            return
+        previous = self._hot.pop(audio.key, None)
+        if previous is not None:
+            self.hot_size -= len(previous.content)
+        self._hot[audio.key] = audio
+        self.hot_size += size
+        while self.hot_size > self.hot_bytes:
+            _, dropped = self._hot.popitem(last=False)
+            self.hot_size -= len(dropped.content)
+
+    def _evict(self):
+        """Drop least recently used clips beyond max_bytes (lock held)."""
+        while self.disk_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self.disk_bytes -= size
+            dropped = self._hot.pop(key, None)
+            if dropped is not None:
+                self.hot_size -= len(dropped.content)
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return self._stats()
+
+    def _stats(self) -> dict:
+        lookups = self.hot_hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "disk_bytes": self.disk_bytes,
+            "hot_entries": len(self._hot),
+            "hot_bytes": self.hot_size,
+            "hot_hits": self.hot_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hot_hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+
+audio_cache = AudioCache()
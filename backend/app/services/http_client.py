@@ -0,0 +1,79 @@
+import os
+import logging
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+HTTP2 = os.getenv("HTTP2", "1") not in ("0", "false", "no")
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401  (installed by httpx[http2])
+    except ImportError:
+        return False
+    return True
+
+
+def create_http_client(**options) -> httpx.AsyncClient:
+    """
+    AsyncClient with the configured pool limits, keep-alive and timeouts.
+    HTTP/2 is negotiated when enabled and httpx[http2] is installed,
+    otherwise connections stay on HTTP/1.1. options override the defaults.
+    """
+    http2 = options.pop("http2", HTTP2)
+    if http2 and not http2_available():
+        logger.warning("HTTP/2 requested but the h2 package is missing (pip install 'httpx[http2]'); using HTTP/1.1")
+        http2 = False
+    settings = {
+        "limits": httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        "timeout": httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        "http2": http2,
+    }
+    settings.update(options)
+    return httpx.AsyncClient(**settings)
+
+
+class SharedHTTPClient:
+    """
+    One application-scoped AsyncClient for every outbound call, so
+    connections (and their TLS sessions) are pooled and kept alive across
+    requests. Started and closed by the FastAPI lifespan handler.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def start(self, **options) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = create_http_client(**options)
+            logger.info(
+                f"Outbound HTTP client ready (max {HTTP_MAX_CONNECTIONS} connections, "
+                f"{HTTP_MAX_KEEPALIVE_CONNECTIONS} keep-alive for {HTTP_KEEPALIVE_EXPIRY:g}s)"
+            )
+        return self._client
+
+    def get(self) -> httpx.AsyncClient:
+        """The shared client, started on first use outside the app (scripts, shells)."""
+        if self._client is None or self._client.is_closed:
+            return self.start()
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+http_client = SharedHTTPClient()
@@ -0,0 +1,80 @@
+import os
+import json
+import logging
+from typing import Dict, Optional
+
+from app.services.audio_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Output directory of scripts/generate_audio_files.py (relative to backend/)
+PRERECORDED_AUDIO_DIR = os.getenv("PRERECORDED_AUDIO_DIR", "../frontend/public/audio")
+
+
+class PrerecordedAudio:
+    """
+    Index of the pre-recorded lines listed in the audio directory's
+    index.json, keyed by normalized text, language and voice ID, so TTS
+    requests for text that is already on disk are served from the file.
+
+    Index paths are URL paths under the web root (e.g.
+    "/audio/en/ui/welcome.mp3"), resolved against the audio directory's
+    parent like the frontend does. An index recorded with another model
+    than the one synthesizing requests is not used, so served audio
+    matches what synthesis would produce.
+    """
+
+    def __init__(self, directory: str = PRERECORDED_AUDIO_DIR):
+        self.directory = directory
+        self.files: Dict[tuple, str] = {}
+        self.hits = 0
+
+    def load(self, model_id: Optional[str] = None) -> int:
+        """Index the lines on disk, skipping entries not recorded with `model_id` (if given)."""
+        index_path = os.path.join(self.directory, "index.json")
+        if not os.path.exists(index_path):
+            logger.warning(f"No pre-recorded audio index at {index_path}; every TTS request is synthesized")
+            self.files = {}
+            return 0
+
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            entries = index["entries"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Ignoring unreadable pre-recorded audio index {index_path}: {e}")
+            self.files = {}
+            return 0
+
+        root = os.path.dirname(os.path.abspath(self.directory))
+        files = {}
+        missing = 0
+        other_model = 0
+        for entry in entries:
+            if model_id is not None and entry.get("model_id", index.get("model_id")) != model_id:
+                other_model += 1
+                continue
+            path = os.path.join(root, entry["path"].lstrip("/"))
+            if not os.path.isfile(path):
+                missing += 1
+                continue
+            # First entry wins when two lines share text and voice
+            files.setdefault((normalize_text(entry["text"]), entry["lang"], entry["voice_id"]), path)
+
+        self.files = files
+        if other_model:
+            logger.warning(f"Skipped {other_model} pre-recorded lines not recorded with {model_id}")
+        logger.info(f"Indexed {len(files)} pre-recorded lines from {index_path} ({missing} files missing)")
+        return len(files)
+
+    def lookup(self, text: str, lang: str, voice_id: str) -> Optional[str]:
+        path = self.files.get((normalize_text(text), lang, voice_id))
+        if path is not None:
+            self.hits += 1
+        return path
+
+    def stats(self) -> dict:
+        return {"lines": len(self.files), "hits": self.hits}
+
+
+prerecorded_audio = PrerecordedAudio()
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one in-flight call.
+
+    The first caller for a key (the leader) starts the call as its own
+    task; callers arriving while it runs await that task instead of
+    starting another, and all of them get its result or its exception.
+    Each caller awaits the task through asyncio.shield, so a cancelled
+    caller (e.g. a client that disconnected) only stops waiting: the call
+    keeps running for the others, and runs to completion even when every
+    caller has left, so its side effects (such as caching) still happen.
+    The key is released as soon as the call finishes; failures are not
+    remembered, so the next caller tries again.
+    """
+
+    def __init__(self, name: str = "singleflight"):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.abandoned = 0  # Callers cancelled while waiting
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def start(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> "asyncio.Task[T]":
+        """The task in flight for key, starting call() as it if there is none."""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+            logger.debug(f"{self.name}: coalesced request for {key!r}")
+        return task
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        task = self.start(key, call)
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                self.abandoned += 1  # This caller was cancelled, not the call
+            raise
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Retrieve the exception so calls nobody waits for anymore do not log "never retrieved"
+        if not task.cancelled() and task.exception() is not None:
+            self.failures += 1
+            logger.debug(f"{self.name}: call for {key!r} failed: {task.exception()}")
+
+    def stats(self) -> dict:
+        requests = self.leaders + self.coalesced
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "abandoned": self.abandoned,
+            "coalesced_ratio": self.coalesced / requests if requests else 0.0,
+        }
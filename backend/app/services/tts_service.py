@@ -1,7 +1,15 @@
 import os
+import asyncio
 import logging
+from typing import AsyncIterator, Dict, List, Optional
+
 import httpx
 
+from app.services.audio_cache import CachedAudio, audio_cache, audio_key
+from app.services.http_client import http_client
+from app.services.prerecorded_audio import prerecorded_audio
+from app.services.singleflight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 # ElevenLabs Voice Mapping (Character -> Voice ID)
@@ -16,6 +24,120 @@ VOICE_MAP = {
 }
 
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY", "")
+ELEVENLABS_API_URL = os.getenv("ELEVENLABS_API_URL", "https://api.elevenlabs.io")
+ELEVENLABS_MODEL_ID = "eleven_multilingual_v2"
+VOICE_SETTINGS = {
+    "stability": 0.5,
+    "similarity_boost": 0.75
+}
+
+# Identical requests in flight at the same time share one synthesis
+synthesis_flights = SingleFlight("tts")
+
+
+class _AudioStream:
+    """
+    Chunks of one streamed synthesis, buffered so that any number of
+    requests can follow it from the first chunk while it is arriving.
+    """
+
+    def __init__(self):
+        self.started = asyncio.get_running_loop().create_future()
+        self.chunks: List[bytes] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._arrived = asyncio.Event()
+
+    def feed(self, chunk: bytes):
+        self.chunks.append(chunk)
+        self._wake()
+
+    def finish(self) -> bytes:
+        self.done = True
+        self._wake()
+        return b"".join(self.chunks)
+
+    def fail(self, error: BaseException):
+        self.error = error
+        if not self.started.done():
+            self.started.set_exception(error)
+            self.started.exception()  # Retrieved: followers that left must not log it
+        self._wake()
+
+    def _wake(self):
+        self._arrived.set()
+        self._arrived = asyncio.Event()
+
+    async def follow(self) -> AsyncIterator[bytes]:
+        sent = 0
+        while True:
+            arrived = self._arrived
+            while sent < len(self.chunks):
+                yield self.chunks[sent]
+                sent += 1
+            if self.error is not None:
+                raise self.error
+            if self.done:
+                return
+            await arrived.wait()
+
+
+# Streamed syntheses in flight, by cache key (each is also a synthesis_flights call)
+_streams: Dict[str, _AudioStream] = {}
+
+
+def voice_for(lang: str, character: str) -> str:
+    """ElevenLabs voice ID for a character and language."""
+    return VOICE_MAP.get(f"{character}_{lang}", VOICE_MAP["luna_en"])
+
+
+def tts_cache_key(text: str, lang: str = "mr", character: str = "luna") -> str:
+    """Audio cache key of a request, covering voice, model and voice settings."""
+    return audio_key(text, lang, character, voice_for(lang, character), ELEVENLABS_MODEL_ID, VOICE_SETTINGS)
+
+
+def prerecorded_path(text: str, lang: str = "mr", character: str = "luna") -> Optional[str]:
+    """Pre-recorded file with the same text, language and voice, if any."""
+    path = prerecorded_audio.lookup(text, lang, voice_for(lang, character))
+    if path is not None:
+        logger.info(f"Pre-recorded audio hit: char={character}, lang={lang}, file={os.path.basename(path)}")
+    return path
+
+
+def cached_audio(text: str, lang: str = "mr", character: str = "luna") -> Optional[CachedAudio]:
+    """The cached clip for a request, if any (never calls ElevenLabs)."""
+    key = tts_cache_key(text, lang, character)
+    cached = audio_cache.get(key)
+    if cached is not None:
+        logger.info(f"Audio cache hit: char={character}, lang={lang}, key={key[:8]}")
+    return cached
+
+
+async def get_audio(
+    text: str,
+    lang: str = "mr",
+    character: str = "luna"
+) -> CachedAudio:
+    """
+    TTS audio from the audio cache, synthesizing (and caching) it on a miss.
+    
+    Concurrent misses for the same cache key are coalesced: one upstream
+    call is made and every caller gets its audio (or its error).
+    
+    Returns:
+        CachedAudio with the cache key, mp3 bytes and ETag
+    """
+    cached = cached_audio(text, lang, character)
+    if cached is not None:
+        return cached
+    
+    key = tts_cache_key(text, lang, character)
+    
+    async def synthesize() -> CachedAudio:
+        content = await _synthesize(text, lang, character)
+        return await asyncio.to_thread(audio_cache.put, key, content)
+    
+    return await synthesis_flights.do(key, synthesize)
 
 
 async def generate_audio(
@@ -24,7 +146,8 @@ async def generate_audio(
     character: str = "luna"
 ) -> bytes:
     """
-    Generate TTS audio using ElevenLabs API.
+    Generate TTS audio using ElevenLabs API (served from the audio cache
+    when the same request was synthesized before).
     
     Args:
         text: Text to speak
@@ -34,27 +157,92 @@ async def generate_audio(
     Returns:
         Audio bytes (mp3)
     """
+    return (await get_audio(text, lang, character)).content
+
+
+async def stream_audio(
+    text: str,
+    lang: str = "mr",
+    character: str = "luna"
+) -> AsyncIterator[bytes]:
+    """
+    Start (or join) synthesis on ElevenLabs' streaming endpoint.
+    
+    Returns once the upstream response has started (so API errors are
+    raised here, before anything is sent to the client) with an iterator
+    over the mp3 chunks as they arrive. The upstream is read by a
+    synthesis_flights call: concurrent streamed requests replay its
+    chunks from the start, get_audio callers get the finished clip, and
+    it is read to the end and cached even if every client disconnects.
+    A streamed request that arrives during a non-streamed synthesis
+    waits for it and gets the clip as a single chunk.
+    """
+    key = tts_cache_key(text, lang, character)
+    if key not in synthesis_flights:
+        _streams[key] = _AudioStream()
+    stream = _streams.get(key)
+    task = synthesis_flights.start(key, lambda: _synthesize_streamed(key, text, lang, character))
+    if stream is None:
+        # A non-streamed synthesis of this clip is running: wait for it
+        audio = await asyncio.shield(task)
+        return _replay(audio.content)
+    
+    await asyncio.shield(stream.started)
+    return stream.follow()
+
+
+async def _synthesize_streamed(key: str, text: str, lang: str, character: str) -> CachedAudio:
+    """Read the streaming endpoint into _streams[key], then cache the whole clip."""
+    stream = _streams[key]
+    try:
+        request = _build_request(text, lang, character, stream=True)
+        try:
+            response = await http_client.get().send(request, stream=True)
+        except Exception as e:
+            logger.error(f"TTS streaming failed: {e}")
+            raise
+        try:
+            if response.is_error:
+                await response.aread()
+                logger.error(f"ElevenLabs API error: {response.status_code} - {response.text}")
+                response.raise_for_status()
+            stream.started.set_result(None)
+            async for chunk in response.aiter_bytes():
+                stream.feed(chunk)
+        finally:
+            await response.aclose()
+    except BaseException as e:
+        stream.fail(e)
+        raise
+    finally:
+        del _streams[key]
+    return await asyncio.to_thread(audio_cache.put, key, stream.finish())
+
+
+async def _replay(content: bytes) -> AsyncIterator[bytes]:
+    yield content
+
+
+def _build_request(text: str, lang: str, character: str, stream: bool = False) -> httpx.Request:
     if not ELEVENLABS_API_KEY:
         raise ValueError("ELEVENLABS_API_KEY not set in environment")
     
     # Get voice ID based on character and language
-    voice_key = f"{character}_{lang}"
-    voice_id = VOICE_MAP.get(voice_key, VOICE_MAP["luna_en"])
+    voice_id = voice_for(lang, character)
     
-    logger.info(f"Generating ElevenLabs TTS: char={character}, lang={lang}, voice={voice_id[:8]}...")
+    logger.info(f"Generating ElevenLabs TTS: char={character}, lang={lang}, voice={voice_id[:8]}, stream={stream}...")
     
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
+    url = f"{ELEVENLABS_API_URL}/v1/text-to-speech/{voice_id}"
+    if stream:
+        url += "/stream"
     headers = {
         "xi-api-key": ELEVENLABS_API_KEY,
         "Content-Type": "application/json"
     }
     payload = {
         "text": text,
-        "model_id": "eleven_multilingual_v2",
-        "voice_settings": {
-            "stability": 0.5,
-            "similarity_boost": 0.75
-        }
+        "model_id": ELEVENLABS_MODEL_ID,
+        "voice_settings": VOICE_SETTINGS
     }
     
     # Add language hint for better pronunciation
@@ -63,11 +251,16 @@ async def generate_audio(
     elif lang == "en":
         payload["language_code"] = "en"
     
+    return http_client.get().build_request("POST", url, json=payload, headers=headers)
+
+
+async def _synthesize(text: str, lang: str, character: str) -> bytes:
+    request = _build_request(text, lang, character)
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            return response.content
+        # Shared, pooled client: no new connection or TLS handshake per request
+        response = await http_client.get().send(request)
+        response.raise_for_status()
+        return response.content
     except httpx.HTTPStatusError as e:
         logger.error(f"ElevenLabs API error: {e.response.status_code} - {e.response.text}")
         raise
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+ToothBuddy Async Extraction Benchmark
+Compares sequential and concurrent action extraction over the real
+storyboard, using a local stub in place of Gemini that answers after a
+fixed latency and can fail a fraction of calls to exercise the retries.
+
+Usage:
+    python bench_async_extraction.py                         # 200 ms stub, concurrency 1 vs 8
+    python bench_async_extraction.py --latency 0.5 --concurrency 4 16
+    python bench_async_extraction.py --rate 10 --failure-rate 0.2
+    python bench_async_extraction.py --batch-size 10
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend" / "app"))
+
+from gemini_action_parser import GeminiActionParser  # noqa: E402
+
+STORYBOARD = Path(__file__).parent.parent / "docs" / "storyboard_script.md"
+
+
+class StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubModel:
+    """Answers every prompt (or every dialogue of a batch prompt) with a fixed action after `latency` seconds."""
+
+    def __init__(self, latency: float, failure_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.calls = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _answer(self, prompt: str) -> StubResponse:
+        self.calls += 1
+        if self.random.random() < self.failure_rate:
+            self.failures += 1
+            raise RuntimeError("stub: 503 Service Unavailable")
+        answer = {"primary_action": "wave", "motion_type": "wave"}
+        if "JSON array" in prompt:
+            answer = [answer] * prompt.count("Dialogue:")
+        return StubResponse("```json\n" + json.dumps(answer) + "\n```")
+
+    def generate_content(self, prompt: str) -> StubResponse:
+        time.sleep(self.latency)
+        return self._answer(prompt)
+
+    async def generate_content_async(self, prompt: str) -> StubResponse:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            return self._answer(prompt)
+        finally:
+            self.in_flight -= 1
+
+
+def run(model: StubModel, concurrency: int, rate: float, batch_size: int) -> float:
+    parser = GeminiActionParser(None)
+    parser.model = model
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull  # Silence fallback messages
+        try:
+            scenes = parser.parse_full_storyboard(
+                str(STORYBOARD), concurrency=concurrency, rate=rate, batch_size=batch_size
+            )
+        finally:
+            sys.stdout = stdout
+    elapsed = time.perf_counter() - start
+    waves = sum(scene["actions"]["primary_action"] == "wave" for scene in scenes)
+    print(f"   concurrency {concurrency:>3}: {elapsed:7.2f} s  {len(scenes)} rows, "
+          f"{model.calls} calls ({model.failures} failed), {waves} from the model, "
+          f"peak in flight {max(model.max_in_flight, 1)}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs concurrent action extraction")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub response latency in seconds")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8], help="Concurrency levels to compare")
+    parser.add_argument("--rate", type=float, help="Rate limit in calls per second")
+    parser.add_argument("--batch-size", type=int, default=1, help="Dialogues per model call")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of stub calls that fail")
+    args = parser.parse_args()
+
+    print(f"⏱  Stub latency {args.latency * 1e3:.0f} ms, rate limit {args.rate or 'none'}, "
+          f"failure rate {args.failure_rate:.0%}, batch size {args.batch_size}")
+    timings = {}
+    for concurrency in args.concurrency:
+        timings[concurrency] = run(StubModel(args.latency, args.failure_rate), concurrency, args.rate, args.batch_size)
+
+    first, last = args.concurrency[0], args.concurrency[-1]
+    print(f"\n📊 concurrency {last} is {timings[first] / timings[last]:.1f}x faster than {first}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+ToothBuddy Outbound HTTP Client Benchmark
+Compares a new httpx.AsyncClient per request (the old TTS behaviour) with
+the shared, pooled client from services/http_client.py, against a local
+stub of the ElevenLabs TTS endpoint that answers after a fixed latency.
+
+The stub is plain HTTP on localhost, so only TCP connects and client
+setup are saved here; against api.elevenlabs.io every new connection
+also pays DNS and a TLS handshake, so the real gap is larger.
+
+Usage:
+    python bench_http_client.py                          # 200 requests, concurrency 1 and 16
+    python bench_http_client.py --requests 500 --concurrency 8 32 64
+    python bench_http_client.py --latency 0.2
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.services.http_client import create_http_client  # noqa: E402
+
+AUDIO = b"\xff\xfb\x90\x00" * 4096  # 16 KB of fake MP3 frames
+
+
+class StubTTSHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    disable_nagle_algorithm = True  # Else kept-alive replies stall on delayed ACKs
+    latency = 0.05
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StubTTSHandler.lock:
+            StubTTSHandler.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Content-Length", str(len(AUDIO)))
+        self.end_headers()
+        self.wfile.write(AUDIO)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub(latency: float) -> ThreadingHTTPServer:
+    StubTTSHandler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubTTSHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run(url: str, requests: int, concurrency: int, shared: bool) -> list:
+    semaphore = asyncio.Semaphore(concurrency)
+    payload = {"text": "Brush your teeth!", "model_id": "eleven_multilingual_v2"}
+    client = create_http_client() if shared else None
+
+    async def one() -> float:
+        async with semaphore:
+            start = time.perf_counter()
+            if shared:
+                response = await client.post(url, json=payload)
+            else:
+                async with httpx.AsyncClient(timeout=30.0) as fresh:
+                    response = await fresh.post(url, json=payload)
+            response.raise_for_status()
+            return time.perf_counter() - start
+
+    try:
+        return await asyncio.gather(*(one() for _ in range(requests)))
+    finally:
+        if client is not None:
+            await client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-request vs shared outbound HTTP clients")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16], help="Concurrency levels")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub response latency in seconds")
+    args = parser.parse_args()
+
+    server = start_stub(args.latency)
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/text-to-speech/stub"
+    print(f"⏱  {args.requests} requests per run, stub latency {args.latency * 1e3:.0f} ms")
+
+    for concurrency in args.concurrency:
+        print(f"\n🔀 concurrency {concurrency}")
+        totals = {}
+        for name, shared in (("per-request", False), ("shared", True)):
+            StubTTSHandler.connections = 0
+            start = time.perf_counter()
+            latencies = sorted(asyncio.run(run(url, args.requests, concurrency, shared)))
+            totals[name] = time.perf_counter() - start
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            overhead = statistics.median(latencies) - args.latency
+            print(f"   {name:<12} {totals[name]:6.2f} s  p50 {statistics.median(latencies) * 1e3:6.1f} ms  "
+                  f"p95 {p95 * 1e3:6.1f} ms  overhead {overhead * 1e3:5.1f} ms  "
+                  f"{StubTTSHandler.connections} connections")
+        print(f"   📊 shared client is {totals['per-request'] / totals['shared']:.2f}x faster")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
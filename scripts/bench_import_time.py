@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+ToothBuddy Import Time Benchmark
+Measures cold-start time (fresh interpreter per run) of the animation
+pipeline on the keyword-fallback path, i.e. without an API key, and how
+much of that the Gemini SDK would add if it were imported eagerly.
+
+Each run is `python -c <statement>` in a new process; the interpreter's
+own startup (`python -c pass`) is reported separately and subtracted.
+
+Usage:
+    python bench_import_time.py                 # 10 runs each
+    python bench_import_time.py --runs 30
+    python bench_import_time.py --importtime    # plus the slowest modules from -X importtime
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+APP_DIR = Path(__file__).parent.parent / "backend" / "app"
+
+SCENARIOS = [
+    ("interpreter", "pass"),
+    ("fallback pipeline", "import generate_animations; generate_animations.AnimationGenerator()"),
+    ("gemini sdk", "import google.generativeai"),
+]
+
+
+def run_once(statement: str, env: dict) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", statement], cwd=APP_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def slowest_imports(statement: str, env: dict, count: int) -> list:
+    """[(cumulative microseconds, module)] from -X importtime, slowest first."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=APP_DIR,
+                            env=env, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative), module))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold-start import time of the animation pipeline")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters per scenario")
+    parser.add_argument("--importtime", action="store_true", help="Show the slowest imports of the fallback path")
+    args = parser.parse_args()
+
+    env = {k: v for k, v in os.environ.items() if k not in ("GEMINI_API_KEY", "ACTION_EXTRACTOR")}
+
+    print(f"⏱  Cold start, median of {args.runs} runs (interpreter startup subtracted)")
+    medians = {}
+    for name, statement in SCENARIOS:
+        try:
+            times = [run_once(statement, env) for _ in range(args.runs)]
+        except subprocess.CalledProcessError:
+            print(f"   {name:<18}  not installed")
+            continue
+        medians[name] = statistics.median(times)
+        shown = medians[name] - (medians["interpreter"] if name != "interpreter" else 0.0)
+        print(f"   {name:<18} {shown * 1e3:8.1f} ms")
+
+    if "gemini sdk" in medians:
+        saved = medians["gemini sdk"] - medians["interpreter"]
+        print(f"\n📊 Lazy backend loading saves ~{saved * 1e3:.0f} ms per fallback-only start")
+
+    if args.importtime:
+        print("\n🐢 Slowest imports on the fallback path (cumulative)")
+        for micros, module in slowest_imports(SCENARIOS[1][1], env, 10):
+            print(f"   {micros / 1e3:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
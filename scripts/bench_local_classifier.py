@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+ToothBuddy Local Classifier Benchmark
+Compares the keyword fallback and the local n-gram classifier: how often
+each agrees with the storyboard's animation hints (labelled by
+local_classifier.HINT_RULES), and how fast each extracts a large batch
+of dialogues.
+
+The classifier is trained on the same storyboards it is scored on, so
+agreement is an in-sample sanity check, not a held-out accuracy.
+
+Usage:
+    python bench_local_classifier.py                 # 10k dialogues
+    python bench_local_classifier.py --dialogues 100000
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend" / "app"))
+
+from gemini_action_parser import GeminiActionParser, KeywordMatcher  # noqa: E402
+from local_classifier import HINT_RULES, TRAINING_STORYBOARDS, train_local_classifier  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local action classifier against keywords")
+    parser.add_argument("--dialogues", type=int, default=10_000, help="Dialogues in the throughput batch")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    classifier = train_local_classifier()
+    print(f"🧠 Trained in {(time.perf_counter() - start) * 1e3:.0f} ms "
+          f"({classifier.centroids.shape[0]} centroids x {classifier.dim} features)")
+
+    keyword = GeminiActionParser(backend="keyword").extractor
+    rows = list(GeminiActionParser(backend="keyword").iter_rows(str(TRAINING_STORYBOARDS["en"])))
+    hints = KeywordMatcher(HINT_RULES)
+    labelled = [(row["dialogue"], hints.match(row["animation_hint"])) for row in rows]
+    labelled = [(dialogue, label["primary_action"]) for dialogue, label in labelled if label]
+    dialogues = [dialogue for dialogue, _ in labelled]
+
+    print(f"\n🎯 Agreement with animation hints ({len(labelled)} rows)")
+    for name, extractor in (("keyword", keyword), ("local", classifier)):
+        predicted = [result["primary_action"] for result in extractor.extract_batch(dialogues)]
+        agreement = sum(p == label for p, (_, label) in zip(predicted, labelled)) / len(labelled)
+        print(f"   {name:<8} {agreement:6.1%}")
+
+    batch = [dialogues[i % len(dialogues)] + f" #{i}" for i in range(args.dialogues)]
+    print(f"\n⏱  {args.dialogues:,} dialogues")
+    for name, extractor in (("keyword", keyword), ("local", classifier)):
+        start = time.perf_counter()
+        extractor.extract_batch(batch)
+        elapsed = time.perf_counter() - start
+        print(f"   {name:<8} {elapsed * 1e3:8.1f} ms ({elapsed / args.dialogues * 1e6:6.1f} µs/dialogue)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+ToothBuddy Animation Pipeline Benchmark
+Times each stage of the storyboard -> animation pipeline on synthetic
+storyboards and records peak memory, writing a JSON results file that
+can be compared across commits (bench_pipeline.json in the temp
+directory unless --output is given).
+
+Stages: parse (keyword fallback, no API key), generate, lottie, threejs,
+timeline (AnimationGenerator.export_combined_timeline).
+
+Usage:
+    python bench_pipeline.py                          # 100, 1k and 10k rows
+    python bench_pipeline.py --sizes 100 1000 --repeat 5
+    python bench_pipeline.py --output after.json --compare before.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend" / "app"))
+
+from generate_animations import AnimationGenerator  # noqa: E402
+
+CHARACTERS = [
+    "## Luna the Tooth Fairy (Ages 1-4)",
+    "## Captain Sparkle (Ages 5-11)",
+    "## Dr. Bright (Ages 12-18)",
+]
+
+# (step, duration, animation hint, dialogue) cycled to fill the storyboard
+ROWS = [
+    ("**Time Greeting**", "5s", "👋 Wave", '"Good morning sunshine! It\'s tooth time!"'),
+    ("**Pick Up Brush**", "5s", "🤲 Hands out", '"Pick up your magic toothbrush! Hold it gently."'),
+    ("**First Rinse**", "8s", "🚿 Rinsing", '"Take a tiny sip of water. Swish swish swish! Spit it out."'),
+    ("**Apply Paste**", "5s", "🦷 Mimics paste", '"Just a teeny tiny bit of paste. Like a grain of rice!"'),
+    ("**Open Wide**", "15s", "👄 Mouth opens wide", '"Can you ROAR like a lion? ROAAR! Open wide!"'),
+    ("**Bottom Teeth**", "15s", "🪥 Brushing motion", '"Wiggle wiggle on the bottom! Baby teeth help you eat!"'),
+    ("**Upper Left**", "20s", "🪥 Angled brushing", '"Upper left sector! Angle your weapon 45 degrees!"'),
+    ("**Front Teeth**", "15s", "🪥 Circular motion", '"Big cheese smile! Circular defense formation!"'),
+    ("**Tongue**", "10s", "👅 Sticks out tongue", '"Stick out your tongue! Brush it gently. Silly face!"'),
+    ("**Celebration**", "5s", "🎉 Thumbs up, jumps", '"HOORAY! Your teeth are SPARKLING! Celebrate!"'),
+]
+
+STAGES = ["parse", "generate", "lottie", "threejs", "timeline"]
+
+
+def write_storyboard(path: str, rows: int):
+    """Write a storyboard with `rows` table rows spread over the three characters."""
+    per_character = -(-rows // len(CHARACTERS))
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# Benchmark Storyboard\n\n")
+        for header in CHARACTERS:
+            f.write(f"{header}\n\n")
+            f.write("| # | Step | Duration | Animation | Dialogue |\n")
+            f.write("|---|------|----------|-----------|----------|\n")
+            for i in range(min(per_character, rows - written)):
+                step, duration, hint, dialogue = ROWS[i % len(ROWS)]
+                f.write(f"| {i + 1} | {step} | {duration} | {hint} | {dialogue} |\n")
+                written += 1
+            f.write("\n---\n\n")
+
+
+def pipeline_stages(storyboard: str, workdir: str) -> list:
+    """[(stage name, callable)] sharing one fresh generator; run them in order."""
+    generator = AnimationGenerator()
+    generator.parser.model = None  # Always the keyword fallback
+    engine = generator.engine
+
+    def parse():
+        generator.scenes = generator.parser.parse_full_storyboard(storyboard)
+
+    def generate():
+        for scene in generator.scenes:
+            anim = engine.generate_animation(scene["actions"], scene["duration"])
+            anim.name = scene["id"]
+            generator.animations[scene["id"]] = anim
+
+    def lottie():
+        for anim in generator.animations.values():
+            engine.export_to_lottie(anim)
+
+    def threejs():
+        for anim in generator.animations.values():
+            engine.export_to_threejs(anim)
+
+    def timeline():
+        generator.export_combined_timeline(os.path.join(workdir, "timeline.json"))
+
+    return list(zip(STAGES, [parse, generate, lottie, threejs, timeline]))
+
+
+def run_stages(storyboard: str, workdir: str) -> dict:
+    """Run every stage once; returns {stage: seconds}."""
+    timings = {}
+    for name, fn in pipeline_stages(storyboard, workdir):
+        start = time.perf_counter()
+        fn()
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def measure_peaks(storyboard: str, workdir: str) -> dict:
+    """Peak traced memory per stage (separate pass: tracing skews timings)."""
+    peaks = {}
+    tracemalloc.start()
+    for name, fn in pipeline_stages(storyboard, workdir):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        peaks[name] = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return peaks
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: dict, baseline_path: str, threshold: float) -> bool:
+    """Print per-stage ratios against a previous results file; True if nothing regressed."""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    print(f"\n📊 Compared with {baseline.get('commit', '?')} ({baseline_path})")
+    ok = True
+    for size, stages in results["results"].items():
+        old_stages = baseline.get("results", {}).get(size)
+        if not old_stages:
+            continue
+        for name, current in stages.items():
+            old = old_stages.get(name)
+            if not old or not old["seconds"]:
+                continue
+            ratio = current["seconds"] / old["seconds"]
+            flag = "  ❌ regression" if ratio > 1 + threshold else ""
+            ok = ok and not flag
+            print(f"   {size:>6} rows {name:<9} {old['seconds'] * 1e3:9.1f} ms -> "
+                  f"{current['seconds'] * 1e3:9.1f} ms ({ratio:5.2f}x){flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the storyboard animation pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="Storyboard row counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per size (best is kept)")
+    parser.add_argument("--output", default=os.path.join(tempfile.gettempdir(), "bench_pipeline.json"),
+                        help="Results file (default: bench_pipeline.json in the temp directory)")
+    parser.add_argument("--compare", help="Previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Slowdown ratio counted as a regression")
+    args = parser.parse_args()
+
+    results = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": {},
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            storyboard = os.path.join(workdir, f"storyboard_{size}.md")
+            write_storyboard(storyboard, size)
+
+            with open(os.devnull, "w") as devnull:
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    runs = [run_stages(storyboard, workdir) for _ in range(args.repeat)]
+                    peaks = measure_peaks(storyboard, workdir)
+                finally:
+                    sys.stdout = stdout
+
+            stages = {
+                name: {"seconds": min(run[name] for run in runs), "peak_bytes": peaks[name]}
+                for name in STAGES
+            }
+            results["results"][str(size)] = stages
+
+            print(f"\n⏱  {size:,} rows")
+            for name, stat in stages.items():
+                print(f"   {name:<9} {stat['seconds'] * 1e3:9.1f} ms   peak {stat['peak_bytes'] / 1e6:8.2f} MB")
+
+    Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"\n✅ Results saved to {args.output}")
+
+    if args.compare and not compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+ToothBuddy Track Memory Benchmark
+Compares the memory held by array-backed AnimationTracks against the old
+layout (a list of Keyframe dataclasses, each with its own properties dict)
+on a synthetic timeline.
+
+Usage:
+    python bench_track_memory.py               # 10k scenes
+    python bench_track_memory.py --scenes 1000
+"""
+
+import sys
+import argparse
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend" / "app"))
+
+from animation_engine import AnimationEngine, Keyframe  # noqa: E402
+
+# One entry per generator, cycled to build the timeline
+ACTIONS = [
+    {"primary_action": "idle"},
+    {"primary_action": "wave"},
+    {"primary_action": "pickup"},
+    {"primary_action": "rinsing"},
+    {"primary_action": "swishing"},
+    {"primary_action": "spitting"},
+    {"primary_action": "applying_paste"},
+    {"primary_action": "openMouth", "emotion": "playful"},
+    {"primary_action": "brushing", "motion_type": "circular", "sub_actions": ["brush_bottom_teeth"]},
+    {"primary_action": "brushing", "motion_type": "wiggle", "sub_actions": ["brush_top_teeth"]},
+    {"primary_action": "brushing", "motion_type": "angled_45"},
+    {"primary_action": "tongueOut", "sub_actions": ["brush_tongue"]},
+    {"primary_action": "celebrate"},
+    {"primary_action": "thumbsUp"},
+]
+
+
+@dataclass
+class LegacyTrack:
+    """The pre-array AnimationTrack layout."""
+    target: str
+    property: str
+    keyframes: List[Keyframe] = field(default_factory=list)
+
+
+def measure(build):
+    """Return (result, bytes still allocated by build())."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark animation track memory")
+    parser.add_argument("--scenes", type=int, default=10_000, help="Number of scenes in the timeline")
+    args = parser.parse_args()
+
+    engine = AnimationEngine(cache_size=0)  # Every scene gets its own tracks
+
+    def build_packed():
+        return [
+            engine.generate_animation(ACTIONS[i % len(ACTIONS)], 5.0 + i % 20).tracks
+            for i in range(args.scenes)
+        ]
+
+    packed, packed_bytes = measure(build_packed)
+    keyframe_count = sum(len(track) for tracks in packed for track in tracks)
+
+    def build_legacy():
+        return [
+            [LegacyTrack(t.target, t.property, t.keyframes) for t in tracks]
+            for tracks in packed
+        ]
+
+    _, legacy_bytes = measure(build_legacy)
+
+    print(f"📊 {args.scenes:,} scenes, {keyframe_count:,} keyframes")
+    print(f"   Keyframe lists: {legacy_bytes / 1e6:8.2f} MB ({legacy_bytes / keyframe_count:6.1f} B/keyframe)")
+    print(f"   Array tracks:   {packed_bytes / 1e6:8.2f} MB ({packed_bytes / keyframe_count:6.1f} B/keyframe)")
+    print(f"   Reduction:      {legacy_bytes / packed_bytes:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+ToothBuddy TTS Time-to-First-Audio Benchmark
+Measures how long a client waits for the first audio bytes (TTFB) and for
+the whole clip from /api/tts/generate, buffered vs streamed, plus a replay
+served from the audio cache.
+
+A local stand-in for ElevenLabs synthesizes a clip as `--chunks` pieces,
+one every `--interval` seconds after `--first-chunk` seconds: its
+streaming endpoint sends each piece as it is ready, the regular endpoint
+only answers once the whole clip is done. The TTS router runs under
+uvicorn on localhost with a temporary audio cache.
+
+Usage:
+    python bench_tts_ttfb.py                   # 5 runs per mode
+    python bench_tts_ttfb.py --runs 10 --chunks 20 --interval 0.1
+"""
+
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+import statistics
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+CHUNK = b"\xff\xfb\x90\x00" * 1024  # 4 KB of fake MP3 frames
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    first_chunk = 0.3
+    interval = 0.1
+    chunks = 10
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        streaming = self.path.endswith("/stream")
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        if streaming:
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i in range(self.chunks):
+                time.sleep(self.first_chunk if i == 0 else self.interval)
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(CHUNK), CHUNK))
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            time.sleep(self.first_chunk + self.interval * (self.chunks - 1))
+            body = CHUNK * self.chunks
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_in_thread(server) -> int:
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_api(port: int):
+    """Serve just the TTS router (no database) with the shared HTTP client."""
+    import uvicorn
+    from contextlib import asynccontextmanager
+    from fastapi import FastAPI
+    from app.routers import tts
+    from app.services.http_client import http_client
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        http_client.start()
+        yield
+        await http_client.aclose()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(tts.router)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+async def measure(url: str, text: str, stream: bool) -> tuple:
+    """(seconds to first body byte, seconds to last byte, bytes)."""
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        start = time.perf_counter()
+        first = None
+        size = 0
+        async with client.stream("POST", url, json={"text": text, "lang": "en", "stream": stream}) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_raw():
+                if first is None:
+                    first = time.perf_counter() - start
+                size += len(chunk)
+        return first, time.perf_counter() - start, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure TTS time-to-first-audio, buffered vs streamed")
+    parser.add_argument("--runs", type=int, default=5, help="Requests per mode")
+    parser.add_argument("--first-chunk", type=float, default=0.3, help="Stand-in seconds until the first chunk")
+    parser.add_argument("--interval", type=float, default=0.1, help="Stand-in seconds between chunks")
+    parser.add_argument("--chunks", type=int, default=10, help="Chunks per clip")
+    args = parser.parse_args()
+
+    StandInHandler.first_chunk = args.first_chunk
+    StandInHandler.interval = args.interval
+    StandInHandler.chunks = args.chunks
+    upstream_port = start_in_thread(ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler))
+
+    # The service reads its configuration at import time
+    os.environ["ELEVENLABS_API_URL"] = f"http://127.0.0.1:{upstream_port}"
+    os.environ.setdefault("ELEVENLABS_API_KEY", "stand-in")
+    os.environ["AUDIO_CACHE_DIR"] = tempfile.mkdtemp(prefix="tts-cache-")
+    sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+    port = free_port()
+    server = start_api(port)
+    url = f"http://127.0.0.1:{port}/api/tts/generate"
+    synthesis = args.first_chunk + args.interval * (args.chunks - 1)
+    print(f"⏱  Stand-in synthesis: first chunk {args.first_chunk * 1e3:.0f} ms, "
+          f"whole clip {synthesis * 1e3:.0f} ms ({args.chunks} x {len(CHUNK) // 1024} KB)")
+
+    modes = [
+        ("buffered", False, lambda i: f"Buffered line {i}"),
+        ("streamed", True, lambda i: f"Streamed line {i}"),
+        ("cached", True, lambda i: "Streamed line 0"),  # Cached by the first streamed run
+    ]
+    for name, stream, text in modes:
+        results = [asyncio.run(measure(url, text(i), stream)) for i in range(args.runs)]
+        ttfb = statistics.median(first for first, _, _ in results)
+        total = statistics.median(last for _, last, _ in results)
+        print(f"   {name:<9} TTFB {ttfb * 1e3:7.1f} ms  complete {total * 1e3:7.1f} ms  "
+              f"({results[0][2] // 1024} KB)")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+ToothBuddy TTS Request Coalescing Check
+Exercises tts_service.get_audio against a slow local stand-in for
+ElevenLabs and checks that concurrent identical requests share one
+upstream synthesis:
+
+  - a burst of identical requests makes one upstream call, same bytes for all
+  - different texts are not coalesced
+  - cancelled callers (even the leader's) do not cancel the call for the rest
+  - a call whose callers all left still completes and lands in the cache
+  - an upstream error reaches every waiter and is not remembered
+  - streamed requests share the upstream call with each other and with
+    non-streamed requests, in either order
+
+Exits non-zero on the first failed check.
+
+Usage:
+    python check_tts_coalescing.py                  # 20 concurrent requests, 300 ms stand-in
+    python check_tts_coalescing.py --requests 100 --latency 1.0
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+from collections import Counter
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+
+class SlowTTSHandler(BaseHTTPRequestHandler):
+    """Answers with audio derived from the text after `latency` seconds; texts starting with "fail" get a 503."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.3
+    calls = Counter()
+    lock = threading.Lock()
+
+    def do_POST(self):
+        text = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))["text"]
+        with SlowTTSHandler.lock:
+            SlowTTSHandler.calls[text] += 1
+        time.sleep(self.latency)
+        status, body = (503, b"overloaded") if text.startswith("fail") else (200, text.encode() * 1000)
+        self.send_response(status)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def check(condition: bool, message: str):
+    if not condition:
+        print(f"❌ {message}")
+        sys.exit(1)
+    print(f"   ✓ {message}")
+
+
+async def run_checks(requests: int, latency: float):
+    from app.services import tts_service
+    from app.services.audio_cache import audio_cache
+    from app.services.http_client import http_client
+
+    get_audio = tts_service.get_audio
+    flights = tts_service.synthesis_flights
+    calls = SlowTTSHandler.calls
+
+    print(f"\n🔁 {requests} identical requests")
+    start = time.perf_counter()
+    results = await asyncio.gather(*(get_audio("Good morning!", "en", "luna") for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    check(calls["Good morning!"] == 1, f"one upstream call (got {calls['Good morning!']})")
+    check(len({audio.content for audio in results}) == 1, "every caller got the same bytes")
+    check(flights.leaders == 1 and flights.coalesced == requests - 1,
+          f"1 leader, {requests - 1} coalesced (got {flights.leaders}, {flights.coalesced})")
+    check(elapsed < latency * 2, f"served in {elapsed * 1e3:.0f} ms, about one upstream latency")
+
+    print("\n🔀 Different texts")
+    await asyncio.gather(get_audio("Brush up", "en"), get_audio("Brush down", "en"))
+    check(calls["Brush up"] == 1 and calls["Brush down"] == 1, "one upstream call per text")
+
+    print("\n✂️  Cancelled callers")
+    abandoned = flights.abandoned
+    tasks = [asyncio.ensure_future(get_audio("Rinse now", "en")) for _ in range(5)]
+    await asyncio.sleep(latency / 3)
+    for task in tasks[:3]:  # Including the leader's caller
+        task.cancel()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    check(all(isinstance(result, asyncio.CancelledError) for result in results[:3]), "cancelled callers were cancelled")
+    check(all(not isinstance(result, BaseException) for result in results[3:]), "the other callers still got audio")
+    check(calls["Rinse now"] == 1, "the shared call was neither cancelled nor repeated")
+    check(flights.abandoned - abandoned == 3, "3 abandoned waiters counted")
+
+    print("\n👻 Every caller cancelled")
+    task = asyncio.ensure_future(get_audio("Spit it out", "en"))
+    await asyncio.sleep(latency / 3)
+    task.cancel()
+    await asyncio.sleep(latency)
+    check(audio_cache.get(tts_service.tts_cache_key("Spit it out", "en")) is not None,
+          "the orphaned call finished and its audio was cached")
+    await get_audio("Spit it out", "en")
+    check(calls["Spit it out"] == 1, "a later request is a cache hit")
+
+    print("\n💥 Upstream failure")
+    results = await asyncio.gather(*(get_audio("fail loudly", "en") for _ in range(5)), return_exceptions=True)
+    check(all(isinstance(result, httpx.HTTPStatusError) for result in results), "every waiter got the 503")
+    check(calls["fail loudly"] == 1, "one upstream call for the failed burst")
+    await asyncio.gather(get_audio("fail loudly", "en"), return_exceptions=True)
+    check(calls["fail loudly"] == 2, "the failure was not remembered; the next request retried")
+
+    print("\n🌊 Streamed requests")
+    async def streamed(text):
+        return b"".join([chunk async for chunk in await tts_service.stream_audio(text, "en")])
+
+    leaders, coalesced = flights.leaders, flights.coalesced
+    results = await asyncio.gather(
+        streamed("Open wide"), streamed("Open wide"), get_audio("Open wide", "en"), streamed("Open wide")
+    )
+    check(calls["Open wide"] == 1, "streamed and plain requests made one upstream call")
+    check(len({result if isinstance(result, bytes) else result.content for result in results}) == 1,
+          "every caller got the same bytes")
+    check(flights.leaders - leaders == 1 and flights.coalesced - coalesced == 3, "1 leader, 3 coalesced")
+    check(audio_cache.get(tts_service.tts_cache_key("Open wide", "en")) is not None, "the streamed clip was cached")
+
+    plain = asyncio.ensure_future(get_audio("Show your teeth", "en"))
+    await asyncio.sleep(latency / 3)
+    content = await streamed("Show your teeth")
+    check(calls["Show your teeth"] == 1 and content == (await plain).content,
+          "a streamed request joined the plain synthesis in flight")
+
+    results = await asyncio.gather(*(streamed("fail to stream") for _ in range(3)), return_exceptions=True)
+    check(all(isinstance(result, httpx.HTTPStatusError) for result in results), "every streamed waiter got the 503")
+    check(calls["fail to stream"] == 1, "one upstream call for the failed streams")
+
+    print(f"\n📊 {flights.stats()}")
+    await http_client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check TTS request coalescing against a slow local stand-in")
+    parser.add_argument("--requests", type=int, default=20, help="Concurrent identical requests")
+    parser.add_argument("--latency", type=float, default=0.3, help="Stand-in latency in seconds")
+    args = parser.parse_args()
+
+    SlowTTSHandler.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowTTSHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # The service reads its configuration at import time
+    os.environ["ELEVENLABS_API_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ.setdefault("ELEVENLABS_API_KEY", "stand-in")
+    os.environ["AUDIO_CACHE_DIR"] = tempfile.mkdtemp(prefix="tts-cache-")
+    sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+    asyncio.run(run_checks(args.requests, args.latency))
+    print("\n✅ All coalescing checks passed")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,11 @@ Usage:
     python generate_audio_files.py              # Generate all audio files
     python generate_audio_files.py --test-only  # Test with single phrase
     python generate_audio_files.py --validate   # Check manifest completeness
+    python generate_audio_files.py --index      # Rebuild index.json from files on disk (no API)
+
+Besides manifest.json (key -> path, used by the frontend), an index.json
+lists every line with its text, language, character and voice ID, so the
+backend can serve these files for matching TTS requests.
 """
 
 import os
@@ -27,6 +32,8 @@ load_dotenv(Path(__file__).parent.parent / ".env")
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY", "")
 OUTPUT_DIR = Path(__file__).parent.parent / "frontend" / "public" / "audio"
 MANIFEST_PATH = OUTPUT_DIR / "manifest.json"
+INDEX_PATH = OUTPUT_DIR / "index.json"
+MODEL_ID = "eleven_multilingual_v2"
 
 # Voice mapping (character -> ElevenLabs voice ID)
 VOICE_MAP = {
@@ -281,10 +288,55 @@ BRUSHING_STEPS = {
 }
 
 
+def voice_id_for(lang: str, character: str) -> str:
+    return VOICE_MAP.get(f"{character}_{lang}", VOICE_MAP.get("ui_en"))
+
+
+def iter_audio_lines():
+    """(section, key, text, lang, character, subdir) for every line, in generation order."""
+    for lang, texts in UI_AUDIO.items():
+        for key, text in texts.items():
+            yield "UI Audio", key, text, lang, "ui", "ui"
+    
+    for character, langs in TIME_GREETINGS.items():
+        age_group = [k for k, v in AGE_GROUPS.items() if v == character][0]
+        for lang, times in langs.items():
+            for time_key, text in times.items():
+                yield "Time Greetings", f"greeting_{time_key}", text, lang, character, age_group
+    
+    for character, langs in WELCOME_COMPLETION.items():
+        age_group = [k for k, v in AGE_GROUPS.items() if v == character][0]
+        for lang, messages in langs.items():
+            for msg_type, text in messages.items():
+                yield "Welcome/Completion Messages", msg_type, text, lang, character, age_group
+    
+    for age_group, langs in BRUSHING_STEPS.items():
+        character = AGE_GROUPS[age_group]
+        for lang, steps in langs.items():
+            for idx, text in enumerate(steps):
+                yield "Brushing Steps", f"step_{idx}", text, lang, character, age_group
+
+
+def index_entry(key: str, text: str, lang: str, character: str, rel_path: str) -> Dict[str, str]:
+    return {
+        "key": f"{key}_{lang}",
+        "lang": lang,
+        "character": character,
+        "voice_id": voice_id_for(lang, character),
+        "text": text,
+        "path": rel_path,
+    }
+
+
+def write_index(entries: List[Dict[str, str]]):
+    index = {"version": 1, "model_id": MODEL_ID, "entries": entries}
+    INDEX_PATH.write_text(json.dumps(index, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"✅ Index saved to {INDEX_PATH} ({len(entries)} lines)")
+
+
 async def generate_audio(text: str, lang: str, character: str) -> bytes:
     """Generate audio using ElevenLabs API."""
-    voice_key = f"{character}_{lang}"
-    voice_id = VOICE_MAP.get(voice_key, VOICE_MAP.get("ui_en"))
+    voice_id = voice_id_for(lang, character)
     
     url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
     headers = {
@@ -293,7 +345,7 @@ async def generate_audio(text: str, lang: str, character: str) -> bytes:
     }
     payload = {
         "text": text,
-        "model_id": "eleven_multilingual_v2",
+        "model_id": MODEL_ID,
         "voice_settings": {
             "stability": 0.5,
             "similarity_boost": 0.75
@@ -362,6 +414,7 @@ async def generate_all_audio(dry_run: bool = False):
     create_directory_structure()
     
     manifest: Dict[str, str] = {}
+    index: List[Dict[str, str]] = []
     total = 0
     generated = 0
     skipped = 0
@@ -378,6 +431,7 @@ async def generate_all_audio(dry_run: bool = False):
         
         if filepath.exists():
             print(f"  ⏭ Skip (exists): {rel_path}")
+            index.append(index_entry(key, text, lang, character, rel_path))
             skipped += 1
             return
         
@@ -389,41 +443,25 @@ async def generate_all_audio(dry_run: bool = False):
             print(f"  🔊 Generating: {rel_path}")
             audio_data = await generate_audio(text, lang, character)
             filepath.write_bytes(audio_data)
+            index.append(index_entry(key, text, lang, character, rel_path))
             generated += 1
             # Rate limiting
             await asyncio.sleep(0.5)
         except Exception as e:
             print(f"  ❌ Error: {e}")
     
-    print("\n📦 Generating UI Audio...")
-    for lang, texts in UI_AUDIO.items():
-        for key, text in texts.items():
-            await add_audio(key, text, lang, "ui", "ui")
-    
-    print("\n📦 Generating Time Greetings...")
-    for character, langs in TIME_GREETINGS.items():
-        for lang, times in langs.items():
-            for time_key, text in times.items():
-                age_group = [k for k, v in AGE_GROUPS.items() if v == character][0]
-                await add_audio(f"greeting_{time_key}", text, lang, character, age_group)
-    
-    print("\n📦 Generating Welcome/Completion Messages...")
-    for character, langs in WELCOME_COMPLETION.items():
-        for lang, messages in langs.items():
-            for msg_type, text in messages.items():
-                age_group = [k for k, v in AGE_GROUPS.items() if v == character][0]
-                await add_audio(msg_type, text, lang, character, age_group)
-    
-    print("\n📦 Generating Brushing Steps...")
-    for age_group, langs in BRUSHING_STEPS.items():
-        character = AGE_GROUPS[age_group]
-        for lang, steps in langs.items():
-            for idx, text in enumerate(steps):
-                await add_audio(f"step_{idx}", text, lang, character, age_group)
+    section = None
+    for line_section, key, text, lang, character, subdir in iter_audio_lines():
+        if line_section != section:
+            section = line_section
+            print(f"\n📦 Generating {section}...")
+        await add_audio(key, text, lang, character, subdir)
     
     # Write manifest
     MANIFEST_PATH.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
     print(f"\n✅ Manifest saved to {MANIFEST_PATH}")
+    if not dry_run:
+        write_index(index)
     print(f"\n📊 Summary: {total} total, {generated} generated, {skipped} skipped")
     
     return manifest
@@ -498,17 +536,35 @@ def validate_manifest():
         print(f"✅ All {len(manifest)} audio files exist!")
 
 
+def rebuild_index():
+    """Write index.json for the lines whose files exist, without calling the API."""
+    entries = []
+    missing = 0
+    for _, key, text, lang, character, subdir in iter_audio_lines():
+        rel_path = f"/audio/{lang}/{subdir}/{key}.mp3"
+        if (OUTPUT_DIR.parent / rel_path.lstrip("/")).exists():
+            entries.append(index_entry(key, text, lang, character, rel_path))
+        else:
+            missing += 1
+    write_index(entries)
+    if missing:
+        print(f"⚠️  {missing} lines have no audio file yet and were left out")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate ToothBuddy audio files")
     parser.add_argument("--test-only", action="store_true", help="Test with single phrase")
     parser.add_argument("--validate", action="store_true", help="Validate manifest")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be generated")
+    parser.add_argument("--index", action="store_true", help="Rebuild index.json from existing files")
     args = parser.parse_args()
     
     if args.test_only:
         asyncio.run(test_single())
     elif args.validate:
         validate_manifest()
+    elif args.index:
+        rebuild_index()
     else:
         asyncio.run(generate_all_audio(dry_run=args.dry_run))
 